@@ -1,123 +1,60 @@
-# Use a pipeline as a high-level helper
-from transformers import pipeline
-
-pipe = pipeline("zero-shot-image-classification", model="facebook/metaclip-h14-fullcc2.5b")
-pipe(
-    "https://huggingface.co/datasets/huggingface/documentation-images/resolve/main/hub/parrots.png",
-    candidate_labels=["animals", "humans", "landscape"],
-)
-
-
-# Use a pipeline as a high-level helper
-from transformers import pipeline
-
-pipe = pipeline("image-feature-extraction", model="facebook/dinov2-giant")
-
-
-# Use a pipeline as a high-level helper
-from transformers import pipeline
-
-pipe = pipeline("image-feature-extraction", model="facebook/dinov2-small")
-
-
-# Use a pipeline as a high-level helper
-from transformers import pipeline
-
-pipe = pipeline("automatic-speech-recognition", model="facebook/wav2vec2-large-960h")
-
-
-# Use a pipeline as a high-level helper
-from transformers import pipeline
-
-pipe = pipeline("text-to-audio", model="facebook/musicgen-stereo-large")
-
-
-# Use a pipeline as a high-level helper
-from transformers import pipeline
-
-pipe = pipeline("text-to-audio", model="facebook/musicgen-stereo-small")
-
-
-# Use a pipeline as a high-level helper
-from transformers import pipeline
-
-pipe = pipeline("text-generation", model="facebook/MobileLLM-R1-950M")
-messages = [
-    {"role": "user", "content": "Who are you?"},
-]
-pipe(messages)
-
-
-# Use a pipeline as a high-level helper
-from transformers import pipeline
-
-pipe = pipeline("text-generation", model="facebook/MobileLLM-R1-140M")
-messages = [
-    {"role": "user", "content": "Who are you?"},
-]
-pipe(messages)
-
-
-
-# Use a pipeline as a high-level helper
-from transformers import pipeline
-
-pipe = pipeline("text-generation", model="facebook/MobileLLM-R1-950M")
-messages = [
-    {"role": "user", "content": "Who are you?"},
+#!/usr/bin/env python3
+"""
+Download the Facebook / companion model checkpoints used by the pipeline.
+
+Only fetches the files needed to load each model later (weights, configs,
+tokenizers). Nothing is instantiated and no inference is run, so this
+stays fast and uses almost no memory. Repos whose local copy already
+matches the remote commit SHA are skipped with a single API call.
+
+Usage:
+    python Download_fbclip-h14.py                 # download every model below
+    python Download_fbclip-h14.py <model_id> ...  # download a subset
+
+Gated repos need a token: run `hf auth login` first or set HF_TOKEN.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from hf_downloader import ModelDownloader, console  # noqa: E402
+
+
+MODELS = [
+    "facebook/metaclip-h14-fullcc2.5b",     # zero-shot-image-classification
+    "facebook/dinov2-giant",                # image-feature-extraction
+    "facebook/dinov2-small",                # image-feature-extraction
+    "facebook/wav2vec2-large-960h",         # automatic-speech-recognition
+    "facebook/musicgen-stereo-large",       # text-to-audio
+    "facebook/musicgen-stereo-small",       # text-to-audio
+    "facebook/MobileLLM-R1-950M",           # text-generation
+    "facebook/MobileLLM-R1-140M",           # text-generation
+    "nvidia/omnivinci",                     # feature-extraction (trust_remote_code)
+    "Qwen/Qwen3-VL-2B-Instruct-GGUF",       # image-text-to-text
+    "deepseek-ai/DeepSeek-OCR",             # image-text-to-text (trust_remote_code)
 ]
-pipe(messages)
-
-
-
-# Use a pipeline as a high-level helper
-from transformers import pipeline
-
-pipe = pipeline("feature-extraction", model="nvidia/omnivinci", trust_remote_code=True)
-
 
+# *.gguf covers the Qwen GGUF repo, *.py the trust_remote_code modeling files
+ALLOW_PATTERNS = ["*.safetensors", "*.gguf", "*.json", "*.txt", "*.py", "tokenizer*"]
 
-hf auth login
 
+def main(argv=None):
+    # Drop duplicate IDs (order-preserving) so no repo is checked twice
+    models = list(dict.fromkeys((argv if argv is not None else sys.argv[1:]) or MODELS))
+    downloader = ModelDownloader(Path(__file__).resolve().parent.parent / "huggingface")
 
+    failed = 0
+    for model_id in models:
+        try:
+            downloader.download_model(model_id, allow_patterns=ALLOW_PATTERNS, check_revision=True)
+        except Exception:
+            failed += 1
 
-
-Qwen/Qwen3-VL-2B-Instruct-GGUF
-
-
-
-from transformers import pipeline
-
-pipe = pipeline("image-text-to-text", model="Qwen/Qwen3-VL-2B-Instruct-GGUF")
-messages = [
-    {
-        "role": "user",
-        "content": [
-            {"type": "image", "url": "https://huggingface.co/datasets/huggingface/documentation-images/resolve/main/p-blog/candy.JPG"},
-            {"type": "text", "text": "What animal is on the candy?"}
-        ]
-    },
-]
-pipe(text=messages)
-
-
-# Use a pipeline as a high-level helper
-from transformers import pipeline
-
-pipe = pipeline("image-text-to-text", model="deepseek-ai/DeepSeek-OCR", trust_remote_code=True)
-messages = [
-    {
-        "role": "user",
-        "content": [
-            {"type": "image", "url": "https://huggingface.co/datasets/huggingface/documentation-images/resolve/main/p-blog/candy.JPG"},
-            {"type": "text", "text": "What animal is on the candy?"}
-        ]
-    },
-]
-
+    console.print(f"\n[green]✅ Done[/green] | [red]❌ Failed: {failed}[/red]\n")
+    return 1 if failed else 0
 
 
-pipe(text=messages)      Copy # Load model directly
-from transformers import AutoModel
-model = AutoModel.from_pretrained("deepseek-ai/DeepSeek-OCR", trust_remote_code=True, torch_dtype="auto") 
-    
\ No newline at end of file
+if __name__ == "__main__":
+    sys.exit(main())
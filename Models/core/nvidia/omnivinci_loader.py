@@ -5,17 +5,21 @@ Loads the nvidia/omnivinci model for scene reaction to external environment.
 This model enables natural scene reactions to external stimuli.
 """
 
+import hashlib
+import json
 import os
 import sys
+from functools import lru_cache
+from pathlib import Path
 from typing import Optional, Any
 import logging
 
-# Setup logging
-logging.basicConfig(level=logging.INFO)
+# Library module: leave handler/level configuration to the application
 logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
 
 try:
-    from transformers import AutoModel
+    from transformers import AutoConfig, AutoModel, BitsAndBytesConfig
     import torch
     TRANSFORMERS_AVAILABLE = True
 except ImportError as e:
@@ -24,6 +28,49 @@ except ImportError as e:
     logger.error("Install with: pip install transformers torch")
 
 
+@lru_cache(maxsize=1)
+def _detect_device() -> str:
+    """Determine the best available device (probed once per process)."""
+    if not TRANSFORMERS_AVAILABLE:
+        return "cpu"
+    
+    if torch.cuda.is_available():
+        return "cuda"
+    elif hasattr(torch.backends, 'mps') and torch.backends.mps.is_available():
+        return "mps"
+    else:
+        return "cpu"
+
+
+@lru_cache(maxsize=1)
+def _supports_bf16() -> bool:
+    """True on Ampere+ CUDA GPUs, where bf16 matches fp16 throughput without overflow."""
+    return _detect_device() == "cuda" and torch.cuda.get_device_capability()[0] >= 8
+
+
+QUANTIZATION_SCHEMES = ("int8", "nf4")
+
+# Quantized checkpoints are cached next to the downloaded hub models
+QUANTIZED_CACHE_ROOT = Path(__file__).resolve().parents[2] / "huggingface"
+QUANTIZED_SENTINEL = "quantization.json"
+
+
+def _build_quantization_config(scheme: str) -> "BitsAndBytesConfig":
+    """Build the bitsandbytes config for a quantization scheme."""
+    if scheme == "int8":
+        return BitsAndBytesConfig(load_in_8bit=True)
+    if scheme == "nf4":
+        return BitsAndBytesConfig(
+            load_in_4bit=True,
+            bnb_4bit_quant_type="nf4",
+            bnb_4bit_compute_dtype=torch.bfloat16,
+            bnb_4bit_use_double_quant=True,
+        )
+    raise ValueError(
+        f"Unknown quantization scheme {scheme!r}; expected one of {QUANTIZATION_SCHEMES}"
+    )
+
+
 class OmniVinciModelLoader:
     """Loader for nvidia/omnivinci model."""
     
@@ -36,26 +83,49 @@ class OmniVinciModelLoader:
         """
         self.model_name = model_name
         self.model: Optional[Any] = None
-        self.device = self._get_device()
-        
-    def _get_device(self) -> str:
-        """Determine the best available device."""
-        if not TRANSFORMERS_AVAILABLE:
-            return "cpu"
-        
-        if torch.cuda.is_available():
-            return "cuda"
-        elif hasattr(torch.backends, 'mps') and torch.backends.mps.is_available():
-            return "mps"
-        else:
-            return "cpu"
-    
-    def load_model(self, device: Optional[str] = None, **kwargs) -> Any:
+        self.device = _detect_device()
+    
+    def _quantized_dir(self, scheme: str) -> Path:
+        """Directory holding the saved post-quantization checkpoint."""
+        base = Path(self.model_name)
+        if not base.is_dir():
+            base = QUANTIZED_CACHE_ROOT / self.model_name
+        return base / "quantized" / scheme
+    
+    def _source_config_hash(self) -> str:
+        """Hash of the source model config, used to invalidate stale checkpoints."""
+        config = AutoConfig.from_pretrained(self.model_name, trust_remote_code=True)
+        return hashlib.sha256(config.to_json_string(use_diff=False).encode()).hexdigest()
+    
+    @staticmethod
+    def _quantized_meta(scheme: str, source_hash: str) -> dict:
+        compute_dtype = "bf16" if scheme == "nf4" else None
+        return {"scheme": scheme, "compute_dtype": compute_dtype, "hash": source_hash}
+    
+    def load_model(
+        self,
+        device: Optional[str] = None,
+        quantization: Optional[str] = None,
+        cache_quantized: bool = True,
+        compile_model: bool = False,
+        **kwargs
+    ) -> Any:
         """
         Load the OmniVinci model.
         
         Args:
             device: Target device (cuda/cpu/mps). Auto-detected if None.
+            quantization: Optional bitsandbytes weight quantization, "int8" or
+                "nf4". Cuts VRAM 2-4x but dequantization slows compute-bound
+                prefill on small batches, so it is opt-in. Requires CUDA and
+                the bitsandbytes package.
+            cache_quantized: Save the quantized weights under
+                ``quantized/<scheme>/`` and reuse them on later loads instead
+                of re-quantizing from the source checkpoint.
+            compile_model: Compile the model's forward with torch.compile on
+                CUDA, so generate() runs compiled steps and the model keeps
+                its type. The first call compiles (kernels are cached in
+                TORCHINDUCTOR_CACHE_DIR). Opt-in; ignored for quantized models.
             **kwargs: Additional arguments for AutoModel.from_pretrained()
             
         Returns:
@@ -63,6 +133,7 @@ class OmniVinciModelLoader:
             
         Raises:
             ImportError: If transformers is not installed
+            ValueError: If the quantization scheme is unknown
             RuntimeError: If model loading fails
         """
         if not TRANSFORMERS_AVAILABLE:
@@ -76,19 +147,62 @@ class OmniVinciModelLoader:
         logger.info(f"Loading OmniVinci model: {self.model_name}")
         logger.info(f"Target device: {device}")
         
+        load_path = self.model_name
+        quantized_dir = None
+        quantized_meta = None
+        
+        if quantization is not None:
+            # bitsandbytes places the quantized modules itself via device_map
+            kwargs.setdefault("quantization_config", _build_quantization_config(quantization))
+            logger.info(f"Quantization: {quantization}")
+            
+            if cache_quantized:
+                quantized_dir = self._quantized_dir(quantization)
+                try:
+                    quantized_meta = self._quantized_meta(quantization, self._source_config_hash())
+                    sentinel = quantized_dir / QUANTIZED_SENTINEL
+                    if sentinel.is_file() and json.loads(sentinel.read_text()) == quantized_meta:
+                        load_path = str(quantized_dir)
+                        logger.info(f"Using cached quantized checkpoint: {quantized_dir}")
+                except Exception as e:
+                    logger.warning(f"Quantized checkpoint cache unavailable: {e}")
+                    quantized_dir = None
+        
         try:
-            # Load model with trust_remote_code and auto dtype
+            # Stream weights straight onto the target device (requires accelerate)
+            # instead of materializing on CPU and copying over with .to(device)
+            if device == "cuda":
+                kwargs.setdefault("torch_dtype", torch.bfloat16 if _supports_bf16() else torch.float16)
+            else:
+                kwargs.setdefault("torch_dtype", "auto")
+            kwargs.setdefault("low_cpu_mem_usage", True)
+            if device != "cpu":
+                kwargs.setdefault("device_map", device)
+            
             model = AutoModel.from_pretrained(
-                self.model_name,
+                load_path,
                 trust_remote_code=True,
-                torch_dtype="auto",
                 **kwargs
             )
             
-            # Move to device if not CPU
-            if device != "cpu":
-                model = model.to(device)
-                logger.info(f"Model moved to {device}")
+            if quantized_dir is not None and load_path == self.model_name:
+                self._save_quantized(model, quantized_dir, quantized_meta)
+            
+            if compile_model and device == "cuda" and hasattr(torch, "compile"):
+                if quantization is not None:
+                    # bitsandbytes int8/nf4 kernels don't go through Inductor
+                    logger.info("Skipping torch.compile for quantized model")
+                else:
+                    # Persist Inductor kernels across processes so warm starts
+                    # skip recompilation; set only once we actually compile
+                    os.environ.setdefault(
+                        "TORCHINDUCTOR_CACHE_DIR",
+                        str(Path.home() / ".cache" / "torchinductor_omnivinci"),
+                    )
+                    # Compile forward in place: wrapping the module would hand
+                    # generate() the uncompiled _orig_mod.forward
+                    model.forward = torch.compile(model.forward, mode="reduce-overhead", fullgraph=False, dynamic=True)
+                    logger.info("Model forward compiled with torch.compile")
             
             self.model = model
             logger.info("OmniVinci model loaded successfully")
@@ -100,6 +214,17 @@ class OmniVinciModelLoader:
             logger.error(error_msg)
             raise RuntimeError(error_msg) from e
     
+    def _save_quantized(self, model: Any, quantized_dir: Path, meta: dict):
+        """Persist a freshly quantized model so later loads skip quantization."""
+        try:
+            quantized_dir.mkdir(parents=True, exist_ok=True)
+            model.save_pretrained(str(quantized_dir), safe_serialization=True)
+            # Sentinel is written last so a partial save is never picked up
+            (quantized_dir / QUANTIZED_SENTINEL).write_text(json.dumps(meta))
+            logger.info(f"Saved quantized checkpoint: {quantized_dir}")
+        except Exception as e:
+            logger.warning(f"Could not save quantized checkpoint: {e}")
+    
     def get_model(self) -> Optional[Any]:
         """Get the loaded model instance."""
         return self.model
@@ -114,7 +239,7 @@ class OmniVinciModelLoader:
             del self.model
             self.model = None
             
-            if torch.cuda.is_available():
+            if _detect_device() == "cuda":
                 torch.cuda.empty_cache()
             
             logger.info("OmniVinci model unloaded")
@@ -128,6 +253,7 @@ def get_omnivinci_model(
     model_name: str = "nvidia/omnivinci",
     device: Optional[str] = None,
     reload: bool = False,
+    quantization: Optional[str] = None,
     **kwargs
 ) -> Any:
     """
@@ -137,6 +263,7 @@ def get_omnivinci_model(
         model_name: HuggingFace model identifier
         device: Target device (cuda/cpu/mps). Auto-detected if None.
         reload: Force reload even if already loaded
+        quantization: Optional weight quantization ("int8" or "nf4")
         **kwargs: Additional arguments for AutoModel.from_pretrained()
         
     Returns:
@@ -148,7 +275,7 @@ def get_omnivinci_model(
         _loader_instance = OmniVinciModelLoader(model_name)
     
     if not _loader_instance.is_loaded() or reload:
-        _loader_instance.load_model(device=device, **kwargs)
+        _loader_instance.load_model(device=device, quantization=quantization, **kwargs)
     
     return _loader_instance.get_model()
 
@@ -167,6 +294,7 @@ def load_omnivinci():
 
 if __name__ == "__main__":
     """Test loading the model."""
+    logging.basicConfig(level=logging.INFO)
     print("Testing OmniVinci model loader...")
     print("=" * 50)
     
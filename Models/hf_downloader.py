@@ -13,20 +13,37 @@ Usage:
 Examples:
     python hf_downloader.py facebook/metaclip-h14-fullcc2.5b
     python hf_downloader.py nvidia/omnivinci Qwen/Qwen3-VL-2B-Instruct
+    python hf_downloader.py --jobs 8 --list models.txt
 """
 
 import argparse
+import os
 import sys
+import warnings
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, DownloadColumn, TransferSpeedColumn
 from rich.tree import Tree
 from rich.panel import Panel
 from rich import box
 
+# Use the Rust hf_transfer downloader (parallel range GETs) when installed.
+# huggingface_hub reads this at import time, so it must be set before importing it.
 try:
-    from huggingface_hub import snapshot_download, HfApi
+    import hf_transfer  # noqa: F401
+    os.environ.setdefault("HF_HUB_ENABLE_HF_TRANSFER", "1")
+except ImportError:
+    pass
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    import huggingface_hub.constants
+    from huggingface_hub import snapshot_download, HfApi, configure_http_backend
     from huggingface_hub.utils import HfHubHTTPError
 except ImportError:
     print("Error: huggingface_hub not installed.")
@@ -36,6 +53,82 @@ except ImportError:
 
 console = Console()
 
+# Commit SHA of the last completed snapshot, written inside each model dir
+SHA_MARKER = ".hf_sha"
+
+
+# Connection pool per thread; sized for snapshot_download's per-file workers
+HTTP_POOL_SIZE = 32
+
+
+def make_http_session() -> "requests.Session":
+    """Build a keep-alive session with a connection pool and retries on transient errors."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_SIZE,
+        pool_maxsize=HTTP_POOL_SIZE,
+        max_retries=Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=None,
+        ),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def hf_transfer_enabled() -> bool:
+    return bool(huggingface_hub.constants.HF_HUB_ENABLE_HF_TRANSFER)
+
+
+# snapshot_download() kwargs that use the plain requests downloader for that
+# call only (hf_transfer is strict about network errors). There is no per-call
+# hf_transfer switch, but huggingface_hub skips hf_transfer whenever `proxies`
+# is passed; an empty mapping changes nothing else, as requests still honours
+# the *_PROXY environment variables. Other --jobs threads keep hf_transfer.
+REQUESTS_DOWNLOADER = {"proxies": {}}
+warnings.filterwarnings("ignore", message="'hf_transfer' does not support `proxies`")
+
+
+def make_progress() -> Progress:
+    """Build the transient download progress display."""
+    return Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        DownloadColumn(),
+        TransferSpeedColumn(),
+        console=console,
+        transient=True,
+    )
+
+
+def is_nonempty_dir(path: Path) -> bool:
+    """True if path is a directory with at least one entry (reads only the first)."""
+    try:
+        with os.scandir(path) as it:
+            return next(it, None) is not None
+    except (FileNotFoundError, NotADirectoryError):
+        return False
+
+
+def dir_stats(path: Path) -> Tuple[int, int]:
+    """Return (file count, total bytes) under path in a single scandir walk."""
+    count = 0
+    total = 0
+    stack = [path]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                else:
+                    count += 1
+                    total += entry.stat(follow_symlinks=False).st_size
+    return count, total
+
 
 class ModelDownloader:
     """Downloads and organizes Hugging Face models."""
@@ -43,6 +136,9 @@ class ModelDownloader:
     def __init__(self, base_dir: Path, token: Optional[str] = None):
         self.base_dir = base_dir.resolve()
         self.token = token
+        # huggingface_hub calls the factory once per thread and caches the session,
+        # so every model_info / file fetch reuses pooled TLS connections
+        configure_http_backend(backend_factory=make_http_session)
         self.api = HfApi(token=token)
         self.base_dir.mkdir(parents=True, exist_ok=True)
     
@@ -54,52 +150,73 @@ class ModelDownloader:
         self, 
         repo_id: str, 
         allow_patterns: Optional[List[str]] = None,
-        ignore_patterns: Optional[List[str]] = None
+        ignore_patterns: Optional[List[str]] = None,
+        progress: Optional[Progress] = None,
+        max_workers: int = 8,
+        check_revision: bool = False,
     ) -> Path:
-        """Download a model and return its local path."""
+        """Download a model and return its local path.
+
+        Pass a shared ``progress`` when downloading several repos from
+        different threads; Rich only allows one live display at a time.
+
+        With ``check_revision`` the "already downloaded" check compares the
+        remote commit SHA against the one recorded by the last download
+        (one API call per repo) instead of just testing for a non-empty dir.
+        """
         local_dir = self.get_model_path(repo_id)
         
         # Check if model already exists
-        if local_dir.exists() and any(local_dir.iterdir()):
+        if not check_revision and is_nonempty_dir(local_dir):
             console.print(f"[yellow]⏭  {repo_id}[/yellow] - Already downloaded")
             return local_dir
         
         try:
             # Verify model exists before downloading
             try:
-                self.api.model_info(repo_id, token=self.token)
+                info = self.api.model_info(repo_id, token=self.token)
             except HfHubHTTPError as e:
                 if e.status_code == 404:
                     console.print(f"[red]❌ {repo_id}[/red] - Model not found on Hugging Face")
                     raise
                 raise
             
+            sha_marker = local_dir / SHA_MARKER
+            if check_revision and info.sha and sha_marker.is_file() and sha_marker.read_text().strip() == info.sha:
+                console.print(f"[yellow]⏭  {repo_id}[/yellow] - Up to date ({info.sha[:7]})")
+                return local_dir
+            
             console.print(f"[cyan]📥 {repo_id}[/cyan] - Starting download...")
             
             local_dir.mkdir(parents=True, exist_ok=True)
             
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                BarColumn(),
-                DownloadColumn(),
-                TransferSpeedColumn(),
-                console=console,
-                transient=True,
-            ) as progress:
+            with nullcontext(progress) if progress is not None else make_progress() as progress:
                 task = progress.add_task(f"Downloading {repo_id}", total=None)
                 
-                snapshot_download(
+                download_kwargs = dict(
                     repo_id=repo_id,
+                    revision=info.sha,
                     local_dir=str(local_dir),
                     local_dir_use_symlinks=False,
                     token=self.token,
                     allow_patterns=allow_patterns,
                     ignore_patterns=ignore_patterns,
                     resume_download=True,
+                    max_workers=max_workers,
                 )
-                
-                progress.update(task, completed=100)
+                try:
+                    try:
+                        snapshot_download(**download_kwargs)
+                    except Exception as e:
+                        if not hf_transfer_enabled():
+                            raise
+                        console.print(f"[yellow]⚠  {repo_id}[/yellow] - hf_transfer failed ({e}), retrying without it")
+                        snapshot_download(**download_kwargs, **REQUESTS_DOWNLOADER)
+                finally:
+                    progress.remove_task(task)
+            
+            if info.sha:
+                sha_marker.write_text(info.sha)
             
             console.print(f"[green]✅ {repo_id}[/green] - Downloaded successfully")
             return local_dir
@@ -110,7 +227,7 @@ class ModelDownloader:
     
     def show_tree(self):
         """Display a nice tree of downloaded models."""
-        if not self.base_dir.exists() or not any(self.base_dir.iterdir()):
+        if not is_nonempty_dir(self.base_dir):
             console.print("[yellow]No models downloaded yet[/yellow]")
             return
         
@@ -122,8 +239,8 @@ class ModelDownloader:
                 
                 for model_dir in sorted(org_dir.iterdir()):
                     if model_dir.is_dir():
-                        file_count = sum(1 for _ in model_dir.rglob('*') if _.is_file())
-                        size_mb = sum(f.stat().st_size for f in model_dir.rglob('*') if f.is_file()) / (1024 * 1024)
+                        file_count, total_bytes = dir_stats(model_dir)
+                        size_mb = total_bytes / (1024 * 1024)
                         org_node.add(
                             f"[green]{model_dir.name}[/green] "
                             f"[dim]({file_count} files, {size_mb:.1f} MB)[/dim]"
@@ -134,13 +251,11 @@ class ModelDownloader:
 
 def load_models_from_file(filepath: Path) -> List[str]:
     """Load model IDs from a text file (one per line)."""
-    models = []
-    with open(filepath, 'r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith('#'):
-                models.append(line)
-    return models
+    return [
+        line
+        for raw in filepath.read_text(encoding='utf-8').splitlines()
+        if (line := raw.strip()) and not line.startswith('#')
+    ]
 
 
 def interactive_mode(downloader: ModelDownloader):
@@ -229,6 +344,18 @@ def main():
         nargs='+',
         help='File patterns to exclude'
     )
+    parser.add_argument(
+        '--workers', '-w',
+        type=int,
+        default=8,
+        help='Concurrent file downloads within each repo (default: 8)'
+    )
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=4,
+        help='Number of repos to download concurrently (default: 4)'
+    )
     
     args = parser.parse_args()
     
@@ -266,16 +393,24 @@ def main():
     successful = 0
     failed = 0
     
-    for model_id in models_to_download:
-        try:
-            downloader.download_model(
+    with make_progress() as progress, ThreadPoolExecutor(max_workers=max(1, args.jobs)) as executor:
+        futures = {
+            executor.submit(
+                downloader.download_model,
                 model_id,
                 allow_patterns=args.allow_patterns,
-                ignore_patterns=args.ignore_patterns
-            )
-            successful += 1
-        except Exception:
-            failed += 1
+                ignore_patterns=args.ignore_patterns,
+                progress=progress,
+                max_workers=max(1, args.workers),
+            ): model_id
+            for model_id in models_to_download
+        }
+        for future in as_completed(futures):
+            try:
+                future.result()
+                successful += 1
+            except Exception:
+                failed += 1
     
     # Summary
     console.print("\n" + "="*60)
@@ -1,10 +1,25 @@
 import argparse
+import os
+import random
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Dict, List, Optional
 
-from huggingface_hub import snapshot_download
+# Use the Rust hf_transfer downloader (parallel range GETs) when installed.
+# huggingface_hub reads this at import time, so it must be set before importing it.
+try:
+    import hf_transfer  # noqa: F401
+    os.environ.setdefault("HF_HUB_ENABLE_HF_TRANSFER", "1")
+except ImportError:
+    pass
+
+import requests
+from huggingface_hub import HfApi, configure_http_backend, snapshot_download
+from huggingface_hub.utils import filter_repo_objects
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
 """
@@ -15,73 +30,209 @@ Usage:
 
 If any repository requires authentication, run `huggingface-cli login` first or
 pass `--hf-token <token>`.
+
+Large files download over multiple connections when `hf_transfer` is installed
+(optional: `pip install hf_transfer`); set HF_HUB_ENABLE_HF_TRANSFER=0 to opt out.
 """
 
+# Files the PyTorch/transformers loaders actually read (safetensors weights,
+# configs, tokenizers, remote code). Used for repos known to ship safetensors so
+# duplicate .bin/TF/Flax/ONNX copies are not downloaded.
+SAFETENSORS_PATTERNS = [
+    "*.safetensors",
+    "*.json",
+    "*.txt",
+    "*.py",
+    "*.model",
+    "*.tiktoken",
+    "tokenizer*",
+]
+
+# Formats nothing in the project loads; skipped for every repo
+IGNORE_PATTERNS = [
+    "*.h5",
+    "*.msgpack",
+    "*.onnx",
+    "*.ot",
+    "flax_model*",
+    "tf_model*",
+    "rust_model*",
+    "onnx/*",
+]
+
 MODEL_SPECS: List[Dict[str, object]] = [
-    {"repo_id": "facebook/metaclip-h14-fullcc2.5b"},
-    {"repo_id": "facebook/dinov2-giant"},
-    {"repo_id": "facebook/dinov2-small"},
+    {"repo_id": "facebook/metaclip-h14-fullcc2.5b", "allow_patterns": SAFETENSORS_PATTERNS},
+    {"repo_id": "facebook/dinov2-giant", "allow_patterns": SAFETENSORS_PATTERNS},
+    {"repo_id": "facebook/dinov2-small", "allow_patterns": SAFETENSORS_PATTERNS},
+    # Older checkpoint: keep pytorch_model.bin, only drop TF/Flax copies
     {"repo_id": "facebook/wav2vec2-large-960h"},
-    {"repo_id": "facebook/musicgen-stereo-large"},
-    {"repo_id": "facebook/musicgen-stereo-small"},
-    {"repo_id": "facebook/MobileLLM-R1-950M"},
-    {"repo_id": "facebook/MobileLLM-R1-140M"},
-    {"repo_id": "nvidia/omnivinci"},
-    {"repo_id": "Qwen/Qwen3-VL-2B-Instruct-GGUF", "allow_patterns": ["*.gguf"]},
-    {"repo_id": "deepseek-ai/DeepSeek-OCR"},
+    {"repo_id": "facebook/musicgen-stereo-large", "allow_patterns": SAFETENSORS_PATTERNS},
+    {"repo_id": "facebook/musicgen-stereo-small", "allow_patterns": SAFETENSORS_PATTERNS},
+    {"repo_id": "facebook/MobileLLM-R1-950M", "allow_patterns": SAFETENSORS_PATTERNS},
+    {"repo_id": "facebook/MobileLLM-R1-140M", "allow_patterns": SAFETENSORS_PATTERNS},
+    {"repo_id": "nvidia/omnivinci", "allow_patterns": SAFETENSORS_PATTERNS},
+    {
+        "repo_id": "Qwen/Qwen3-VL-2B-Instruct-GGUF",
+        "allow_patterns": ["*.gguf"],
+        "ignore_patterns": ["*.bin", "*.pt", "*.h5", "flax_model*", "onnx/*"],
+    },
+    {"repo_id": "deepseek-ai/DeepSeek-OCR", "allow_patterns": SAFETENSORS_PATTERNS},
 ]
 
 
-def download_models(destination: Path, token: Optional[str] = None, max_retries: int = 3) -> None:
-    """Download all models and organize them properly with retry logic."""
-    destination.mkdir(parents=True, exist_ok=True)
+HTTP_POOL_SIZE = 32
+
+# Commit SHA of the last completed snapshot, written inside each model dir
+# (same marker as Models/hf_downloader.py)
+SHA_MARKER = ".hf_sha"
+
+# Failures worth restarting a repo download for (after urllib3's own retries)
+NETWORK_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+    ConnectionError,
+    TimeoutError,
+)
+
+
+def make_http_session() -> requests.Session:
+    """Session whose requests retry transient errors with jittered exponential backoff."""
+    retry_kwargs = dict(
+        total=5,
+        backoff_factor=1.0,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=frozenset(["GET", "HEAD"]),
+    )
+    try:
+        retry = Retry(backoff_jitter=0.5, **retry_kwargs)
+    except TypeError:  # urllib3 < 2 has no backoff_jitter
+        retry = Retry(**retry_kwargs)
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
 
-    for spec in MODEL_SPECS:
-        repo_id = spec["repo_id"]  # type: ignore[index]
-        allow_patterns = spec.get("allow_patterns")
-        
-        # Organize as org/model-name structure
-        org, model_name = repo_id.split("/", 1)
-        org_dir = destination / org
-        org_dir.mkdir(exist_ok=True)
-        local_dir = org_dir / model_name
-
-        print(f"[download] {repo_id} → {local_dir}")
-        
-        # Retry logic for network failures
-        last_error = None
-        for attempt in range(1, max_retries + 1):
-            try:
-                snapshot_download(
-                    repo_id=repo_id,  # type: ignore[arg-type]
-                    local_dir=str(local_dir),
-                    token=token,
-                    allow_patterns=allow_patterns,
-                    # Downloads automatically resume if interrupted
-                    # No need for deprecated resume_download parameter
-                )
-                print(f"[OK] {repo_id} downloaded successfully")
-                break  # Success, exit retry loop
-            except Exception as e:
-                last_error = e
-                error_msg = str(e)
-                
-                # Check if it's a network/connection error
-                is_network_error = any(keyword in error_msg.lower() for keyword in [
-                    'connection', 'reset', 'timeout', 'network', '10054', 
-                    'cas service error', 'connectionreset'
-                ])
-                
-                if attempt < max_retries and is_network_error:
-                    wait_time = attempt * 5  # Exponential backoff: 5s, 10s, 15s
-                    print(f"[RETRY {attempt}/{max_retries}] Network error, retrying in {wait_time}s...")
-                    time.sleep(wait_time)
+def _is_complete(local_dir: Path, info, allow_patterns, ignore_patterns) -> bool:
+    """True if every file the download would fetch already exists locally with the remote size."""
+    siblings = list(filter_repo_objects(
+        info.siblings or [],
+        allow_patterns=allow_patterns,
+        ignore_patterns=ignore_patterns,
+        key=lambda sibling: sibling.rfilename,
+    ))
+    if not siblings:
+        return False
+    for sibling in siblings:
+        try:
+            size = (local_dir / sibling.rfilename).stat().st_size
+        except OSError:
+            return False
+        if sibling.size is not None and size != sibling.size:
+            return False
+    return True
+
+
+def _download_one(
+    spec: Dict[str, object],
+    destination: Path,
+    token: Optional[str],
+    max_retries: int,
+    max_workers: int,
+) -> None:
+    """Download a single repo into destination/org/model-name with retry logic."""
+    repo_id = spec["repo_id"]  # type: ignore[index]
+    allow_patterns = spec.get("allow_patterns")
+    ignore_patterns = spec.get("ignore_patterns", IGNORE_PATTERNS)
+    
+    # Organize as org/model-name structure
+    org, model_name = repo_id.split("/", 1)
+    org_dir = destination / org
+    org_dir.mkdir(exist_ok=True)
+    local_dir = org_dir / model_name
+
+    # One API call tells us the current commit and the file sizes; skip the
+    # repo when the marker matches or every expected file is already present
+    revision = None
+    try:
+        info = HfApi().model_info(repo_id, token=token, files_metadata=True)  # type: ignore[arg-type]
+    except Exception as e:
+        print(f"[warn] {repo_id}: could not fetch repo info ({e}); downloading anyway")
+    else:
+        revision = info.sha
+        sha_marker = local_dir / SHA_MARKER
+        if revision and sha_marker.is_file() and sha_marker.read_text().strip() == revision:
+            print(f"[skip] {repo_id} up to date ({revision[:7]})")
+            return
+        if revision and _is_complete(local_dir, info, allow_patterns, ignore_patterns):
+            sha_marker.write_text(revision)
+            print(f"[skip] {repo_id} already present ({revision[:7]})")
+            return
+
+    print(f"[download] {repo_id} → {local_dir}")
+    
+    # Retry logic for network failures
+    last_error = None
+    for attempt in range(1, max_retries + 1):
+        try:
+            snapshot_download(
+                repo_id=repo_id,  # type: ignore[arg-type]
+                revision=revision,
+                local_dir=str(local_dir),
+                token=token,
+                allow_patterns=allow_patterns,
+                ignore_patterns=ignore_patterns,
+                max_workers=max_workers,
+                # Downloads automatically resume if interrupted
+                # No need for deprecated resume_download parameter
+            )
+            if revision:
+                (local_dir / SHA_MARKER).write_text(revision)
+            print(f"[OK] {repo_id} downloaded successfully")
+            break  # Success, exit retry loop
+        except Exception as e:
+            last_error = e
+            
+            # Individual requests already retry inside the HTTP session; this
+            # only restarts the repo (completed files are kept) on network errors
+            if attempt < max_retries and isinstance(e, NETWORK_ERRORS):
+                wait_time = 5 * 2 ** (attempt - 1) + random.uniform(0, 2.5)  # 5s, 10s, ... + jitter
+                print(f"[RETRY {attempt}/{max_retries}] Network error, retrying in {wait_time:.1f}s...")
+                time.sleep(wait_time)
+            else:
+                if attempt >= max_retries:
+                    print(f"[ERROR] Failed to download {repo_id} after {max_retries} attempts: {last_error}")
                 else:
-                    if attempt >= max_retries:
-                        print(f"[ERROR] Failed to download {repo_id} after {max_retries} attempts: {last_error}")
-                    else:
-                        print(f"[ERROR] Failed to download {repo_id}: {e}")
-                    break  # Exit retry loop
+                    print(f"[ERROR] Failed to download {repo_id}: {e}")
+                break  # Exit retry loop
+
+
+def download_models(
+    destination: Path,
+    token: Optional[str] = None,
+    max_retries: int = 3,
+    concurrency: int = 4,
+    max_workers: int = 8,
+) -> None:
+    """
+    Download all models and organize them properly with retry logic.
+
+    Up to `concurrency` repos download at once; each repo fetches up to
+    `max_workers` files in parallel.
+    """
+    destination.mkdir(parents=True, exist_ok=True)
+    configure_http_backend(backend_factory=make_http_session)
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        futures = [
+            executor.submit(_download_one, spec, destination, token, max_retries, max_workers)
+            for spec in MODEL_SPECS
+        ]
+        for future in as_completed(futures):
+            future.result()
 
 
 def main() -> None:
@@ -101,10 +252,28 @@ def main() -> None:
         help="Optional Hugging Face token (otherwise uses cached credentials).",
     )
 
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Number of repositories to download in parallel (default: 4).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="Parallel file downloads within each repository (default: 8).",
+    )
+
     args = parser.parse_args()
 
     try:
-        download_models(destination=args.output, token=args.hf_token)
+        download_models(
+            destination=args.output,
+            token=args.hf_token,
+            concurrency=args.concurrency,
+            max_workers=args.workers,
+        )
     except Exception as exc:  # pragma: no cover - surface full trace to caller
         print(f"[error] {exc}", file=sys.stderr)
         raise
@@ -3,11 +3,42 @@
 Fix import paths to use relative imports from src/ directory.
 """
 
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 BASE_DIR = Path(__file__).parent.parent
 
+SKIP_DIRS = {'__pycache__', 'node_modules', '.git'}
+
+# File reads/writes are I/O bound, so they run on a thread pool
+MAX_WORKERS = 32
+
+# Compiled once; (pattern, replacement) per location
+API_IMPORTS = [
+    (re.compile(r'from src\.backend\.services\.'), 'from ...services.'),
+    (re.compile(r'from src\.backend\.utils\.'), 'from ...utils.'),
+    (re.compile(r'from src\.backend\.api\.models\.'), 'from ..models.'),
+]
+SERVICES_IMPORTS = [
+    (re.compile(r'from src\.backend\.services\.'), 'from backend.services.'),
+    (re.compile(r'from src\.backend\.utils\.'), 'from backend.utils.'),
+    (re.compile(r'from src\.backend\.workers\.'), 'from backend.workers.'),
+]
+OTHER_IMPORTS = [
+    (re.compile(r'from src\.backend\.'), 'from backend.'),
+]
+
+
+def iter_python_files(directory: Path):
+    """Yield .py files under directory, pruning cache/vendor dirs during the walk."""
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+        for name in files:
+            if name.endswith('.py'):
+                yield Path(root) / name
+
 def fix_file_imports(file_path: Path):
     """Fix imports in a single file using relative paths."""
     try:
@@ -16,25 +47,19 @@ def fix_file_imports(file_path: Path):
         
         original = content
         
-        # Calculate relative depth from src/
-        relative_path = file_path.relative_to(BASE_DIR / "src")
-        depth = len(relative_path.parts) - 1
-        
         # Replace src.backend. with relative imports
         if 'src.backend.' in content:
             # For files in src/backend/api/, use relative imports
             if 'backend/api' in str(file_path):
-                content = re.sub(r'from src\.backend\.services\.', 'from ...services.', content)
-                content = re.sub(r'from src\.backend\.utils\.', 'from ...utils.', content)
-                content = re.sub(r'from src\.backend\.api\.models\.', 'from ..models.', content)
+                replacements = API_IMPORTS
             # For files in src/backend/services/, use relative imports
             elif 'backend/services' in str(file_path):
-                content = re.sub(r'from src\.backend\.services\.', 'from backend.services.', content)
-                content = re.sub(r'from src\.backend\.utils\.', 'from backend.utils.', content)
-                content = re.sub(r'from src\.backend\.workers\.', 'from backend.workers.', content)
+                replacements = SERVICES_IMPORTS
             else:
                 # Use absolute imports from src/
-                content = re.sub(r'from src\.backend\.', 'from backend.', content)
+                replacements = OTHER_IMPORTS
+            for pattern, replacement in replacements:
+                content = pattern.sub(replacement, content)
         
         if content != original:
             with open(file_path, 'w', encoding='utf-8') as f:
@@ -47,13 +72,14 @@ def fix_file_imports(file_path: Path):
 
 def main():
     """Main function."""
-    python_files = list((BASE_DIR / "src" / "backend").rglob("*.py"))
+    python_files = list(iter_python_files(BASE_DIR / "src" / "backend"))
+    
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        results = executor.map(fix_file_imports, python_files)
     
     updated = 0
-    for file_path in python_files:
-        if '__pycache__' in str(file_path):
-            continue
-        if fix_file_imports(file_path):
+    for file_path, changed in zip(python_files, results):
+        if changed:
             print(f"Fixed: {file_path.relative_to(BASE_DIR)}")
             updated += 1
     
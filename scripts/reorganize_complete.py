@@ -7,6 +7,7 @@ Removes duplicates, consolidates directories, and fixes import paths.
 import os
 import shutil
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Tuple, Set
 
@@ -29,18 +30,25 @@ FILES_TO_MOVE: List[Tuple[str, str]] = [
     ("Models/cache", "Models/huggingface/cache"),
 ]
 
-# Import path replacements
-IMPORT_REPLACEMENTS = [
-    # Old: from services. -> New: from backend.services.
-    (r'from\s+services\.', 'from backend.services.'),
-    (r'import\s+services\.', 'import backend.services.'),
-    # Old: from python. -> New: from backend.api.
-    (r'from\s+python\.', 'from backend.api.'),
-    (r'import\s+python\.', 'import backend.api.'),
-    # Old: from renderer. -> New: from frontend.renderer.
-    (r'from\s+renderer\.', 'from frontend.renderer.'),
-    (r'import\s+renderer\.', 'import frontend.renderer.'),
-]
+# Import path replacements, old top-level package -> new package:
+#   from/import services.  -> backend.services.
+#   from/import python.    -> backend.api.
+#   from/import renderer.  -> frontend.renderer.
+IMPORT_TARGETS = {
+    'services': 'backend.services',
+    'python': 'backend.api',
+    'renderer': 'frontend.renderer',
+}
+
+# The rewrites never overlap, so one alternation applies them all in a single pass
+IMPORT_PATTERN = re.compile(r'(from|import)\s+(' + '|'.join(IMPORT_TARGETS) + r')\.')
+
+# Every match contains one of these; files without them skip the regex
+IMPORT_LITERALS = tuple(f'{package}.' for package in IMPORT_TARGETS)
+
+
+def _rewrite_import(match: re.Match) -> str:
+    return f"{match.group(1)} {IMPORT_TARGETS[match.group(2)]}."
 
 
 def remove_directory(path: Path) -> bool:
@@ -95,9 +103,11 @@ def update_imports_in_file(file_path: Path) -> bool:
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
         
+        if not any(literal in content for literal in IMPORT_LITERALS):
+            return False
+        
         original_content = content
-        for pattern, replacement in IMPORT_REPLACEMENTS:
-            content = re.sub(pattern, replacement, content)
+        content = IMPORT_PATTERN.sub(_rewrite_import, content)
         
         if content != original_content:
             with open(file_path, 'w', encoding='utf-8') as f:
@@ -109,16 +119,29 @@ def update_imports_in_file(file_path: Path) -> bool:
     return False
 
 
+SKIP_DIRS = {'node_modules', '__pycache__', '.git', '.next', 'dist', 'build'}
+
+# Import rewrites are I/O bound, so they run on a thread pool
+UPDATE_WORKERS = 16
+
+
 def find_python_files(directory: Path) -> List[Path]:
     """Find all Python files in a directory."""
     python_files = []
-    for root, dirs, files in os.walk(directory):
-        # Skip node_modules, __pycache__, .git, etc.
-        dirs[:] = [d for d in dirs if d not in ['node_modules', '__pycache__', '.git', '.next', 'dist', 'build']]
-        
-        for file in files:
-            if file.endswith('.py'):
-                python_files.append(Path(root) / file)
+    stack = [str(directory)]
+    while stack:
+        try:
+            # scandir entries carry the file type, so no extra stat() per entry
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        # Skip node_modules, __pycache__, .git, etc.
+                        if entry.name not in SKIP_DIRS:
+                            stack.append(entry.path)
+                    elif entry.name.endswith('.py') and entry.is_file():
+                        python_files.append(Path(entry.path))
+        except OSError:
+            continue
     return python_files
 
 
@@ -154,10 +177,8 @@ def main():
     # Step 3: Update import paths
     print("[STEP 3] Updating import paths...")
     python_files = find_python_files(ROOT / "src")
-    updated_count = 0
-    for py_file in python_files:
-        if update_imports_in_file(py_file):
-            updated_count += 1
+    with ThreadPoolExecutor(max_workers=UPDATE_WORKERS) as executor:
+        updated_count = sum(executor.map(update_imports_in_file, python_files))
     print(f"[STEP 3] Updated {updated_count} Python files")
     print()
     
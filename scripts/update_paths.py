@@ -3,7 +3,9 @@
 Update all file paths in code to match new directory structure.
 """
 
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 BASE_DIR = Path(__file__).parent.parent
@@ -24,17 +26,52 @@ PATH_REPLACEMENTS = [
     (r'"Models/core/tts/fish-speech/output"', '"assets/audio/tts/fish-speech"'),
 ]
 
+def _required_literal(pattern: str) -> str:
+    """Longest regex-free run in a pattern; a file can only match if it contains it."""
+    return max(re.split(r'\\.|[.*+?()\[\]{}|^$]', pattern), key=len)
+
+
+# Compiled once, applied in order (later patterns rely on earlier ones). Each
+# carries a literal that must be present, so non-matching patterns are skipped
+# with a substring check instead of a regex scan.
+COMPILED_REPLACEMENTS = [
+    (_required_literal(pattern), re.compile(pattern), replacement)
+    for pattern, replacement in PATH_REPLACEMENTS
+]
+
+# Every pattern contains one of these; files without them skip the regexes
+LITERALS = ('logs/', 'Models/')
+
+SKIP_DIRS = {'__pycache__', 'node_modules', '.git'}
+
+# File reads/writes are I/O bound, so they run on a thread pool
+MAX_WORKERS = 32
+
+
+def iter_python_files(directory: Path):
+    """Yield .py files under directory, pruning cache/vendor dirs during the walk."""
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+        for name in files:
+            if name.endswith('.py'):
+                yield Path(root) / name
+
+
 def update_file_paths(file_path: Path):
     """Update paths in a single file."""
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
         
+        if not any(literal in content for literal in LITERALS):
+            return False
+        
         original = content
         
         # Apply all replacements
-        for pattern, replacement in PATH_REPLACEMENTS:
-            content = re.sub(pattern, replacement, content)
+        for literal, pattern, replacement in COMPILED_REPLACEMENTS:
+            if literal in content:
+                content = pattern.sub(replacement, content)
         
         if content != original:
             with open(file_path, 'w', encoding='utf-8') as f:
@@ -47,13 +84,14 @@ def update_file_paths(file_path: Path):
 
 def main():
     """Main function."""
-    python_files = list((BASE_DIR / "src" / "backend").rglob("*.py"))
+    python_files = list(iter_python_files(BASE_DIR / "src" / "backend"))
+    
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        results = executor.map(update_file_paths, python_files)
     
     updated = 0
-    for file_path in python_files:
-        if '__pycache__' in str(file_path):
-            continue
-        if update_file_paths(file_path):
+    for file_path, changed in zip(python_files, results):
+        if changed:
             print(f"Updated: {file_path.relative_to(BASE_DIR)}")
             updated += 1
     
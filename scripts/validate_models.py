@@ -11,11 +11,24 @@ Validates Models/manifest.json against the file system:
 Can be integrated into CI/CD pipelines.
 """
 
+import fnmatch
+import io
 import json
+import os
+import re
+import stat
 import sys
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so handlers need no change
+    _loads = orjson.loads
+except ImportError:  # fall back to stdlib json
+    _loads = json.loads
 
 
 def find_available_port(start_port: int = 8000, max_attempts: int = 100) -> int:
@@ -45,27 +58,103 @@ def is_port_available(port: int) -> bool:
         return False
 
 
+# Upper bound on concurrent per-model validations
+MAX_WORKERS = 32
+
+# '*.yaml' config patterns also accept .yml, checked in the same pass
+_YAML_SUFFIXES = ('.yaml', '.yml')
+
+# Path.glob matches case-insensitively on Windows; the cached-listing matchers follow suit
+_GLOB_FLAGS = re.IGNORECASE if os.name == 'nt' else 0
+
+# License strings accepted without an "Unknown license format" warning
+_KNOWN_LICENSES = frozenset({
+    'Apache-2.0', 'MIT', 'MPL-2.0', 'GPL', 'LGPL',
+    'NVIDIA Proprietary', 'CC-BY-NC-SA-4.0', 'Tongyi Qianwen'
+})
+
+
 class ModelValidator:
     """Validates model manifest against file system."""
     
+    # Compiled fnmatch regexes, keyed by glob; manifests reuse the same few patterns
+    _pattern_cache: Dict[str, re.Pattern] = {}
+    
     def __init__(self, manifest_path: Path, repo_root: Path):
         self.manifest_path = manifest_path
         self.repo_root = repo_root
         self.errors: List[str] = []
         self.warnings: List[str] = []
-        self.info: List[str] = []
+        # Info lines are only ever dumped in bulk, so they go straight into one buffer
+        self.info = io.StringIO()
+        # One scandir listing (entry names) per directory, shared by every check on it
+        self._scan_cache: Dict[Path, List[str]] = {}
+        
+    def _note(self, msg: str) -> None:
+        """Record an info line, already indented for the report."""
+        self.info.write(f"  {msg}\n")
+    
+    def _get_entries(self, path: Path) -> List[str]:
+        """List a directory's names once; raises OSError if it is missing or not a directory."""
+        names = self._scan_cache.get(path)
+        if names is None:
+            with os.scandir(path) as it:
+                names = [e.name for e in it]
+            self._scan_cache[path] = names
+        return names
+    
+    def _get_names(self, path: Path) -> List[str]:
+        """Entry names of a directory, or an empty list if it cannot be listed."""
+        try:
+            return self._get_entries(path)
+        except OSError:
+            return []
+    
+    @staticmethod
+    def _has_name(names: List[str], name: str) -> bool:
+        """Whether a listing holds `name`, case-insensitively on Windows like exists()."""
+        name = os.path.normcase(name)
+        return any(os.path.normcase(n) == name for n in names)
         
+    @classmethod
+    def _compile(cls, pattern: str) -> re.Pattern:
+        """Translate and compile a glob pattern once per process."""
+        regex = cls._pattern_cache.get(pattern)
+        if regex is None:
+            regex = cls._pattern_cache[pattern] = re.compile(fnmatch.translate(pattern), _GLOB_FLAGS)
+        return regex
+    
+    @classmethod
+    def _match(cls, pattern: str, names: List[str]) -> List[str]:
+        """Names matching a glob pattern."""
+        regex = cls._compile(pattern)
+        return [n for n in names if regex.match(n)]
+    
+    @staticmethod
+    def _checkpoint_glob(checkpoint_pattern: str) -> str:
+        """Checkpoint patterns match as a suffix, whatever wildcards they carry."""
+        return f"*{checkpoint_pattern.replace('*', '')}"
+    
     def load_manifest(self) -> Dict:
         """Load manifest.json."""
         try:
-            with open(self.manifest_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            # Parse the raw bytes; no text-mode decode pass
+            manifest = _loads(self.manifest_path.read_bytes())
         except FileNotFoundError:
             self.errors.append(f"Manifest file not found: {self.manifest_path}")
             return {}
         except json.JSONDecodeError as e:
             self.errors.append(f"Invalid JSON in manifest: {e}")
             return {}
+        
+        # Compile every weights pattern up front, once per distinct glob
+        for model in manifest.get('models', []):
+            weights = model.get('weights') or {}
+            if weights.get('checkpoint_pattern'):
+                self._compile(self._checkpoint_glob(weights['checkpoint_pattern']))
+            if weights.get('config_pattern'):
+                self._compile(weights['config_pattern'])
+        return manifest
     
     def validate_path(self, model: Dict) -> bool:
         """Validate that model path exists."""
@@ -75,15 +164,27 @@ class ModelValidator:
             return False
         
         model_path = self.repo_root / path_str
-        if not model_path.exists():
+        # A single scandir both proves the directory exists and primes the cache
+        try:
+            self._get_entries(model_path)
+        except FileNotFoundError:
             self.warnings.append(f"Model path does not exist: {path_str}")
             return False
-        
-        if not model_path.is_dir():
+        except NotADirectoryError:
             self.warnings.append(f"Model path is not a directory: {path_str}")
             return False
+        except OSError:
+            # Present but unlistable (e.g. permissions): one stat settles the type
+            try:
+                is_dir = stat.S_ISDIR(model_path.stat().st_mode)
+            except OSError:
+                self.warnings.append(f"Model path does not exist: {path_str}")
+                return False
+            if not is_dir:
+                self.warnings.append(f"Model path is not a directory: {path_str}")
+                return False
         
-        self.info.append(f"✓ Path exists: {path_str}")
+        self._note(f"✓ Path exists: {path_str}")
         return True
     
     def validate_weights(self, model: Dict) -> bool:
@@ -91,7 +192,7 @@ class ModelValidator:
         weights = model.get('weights', {})
         if not weights:
             # Some models download at runtime, so this is OK
-            self.info.append(f"  No weights specified (likely runtime download): {model.get('id')}")
+            self._note(f"  No weights specified (likely runtime download): {model.get('id')}")
             return True
         
         path_str = model.get('path', '')
@@ -99,36 +200,36 @@ class ModelValidator:
             return False
         
         model_path = self.repo_root / path_str
+        names = self._get_names(model_path)
         
         # Check for checkpoint patterns
         checkpoint_pattern = weights.get('checkpoint_pattern')
         if checkpoint_pattern:
-            pattern = checkpoint_pattern.replace('*', '')
-            found = list(model_path.glob(f"*{pattern}"))
+            found = self._match(self._checkpoint_glob(checkpoint_pattern), names)
             if not found:
                 self.warnings.append(f"  No checkpoints found matching '{checkpoint_pattern}' in {path_str}")
                 return False
             else:
-                self.info.append(f"  ✓ Found {len(found)} checkpoint(s) matching '{checkpoint_pattern}'")
+                self._note(f"  ✓ Found {len(found)} checkpoint(s) matching '{checkpoint_pattern}'")
         
         # Check for config patterns
         config_pattern = weights.get('config_pattern')
         if config_pattern:
             if config_pattern == '*.yaml':
-                found = list(model_path.glob('*.yaml')) + list(model_path.glob('*.yml'))
+                found = [n for n in names if os.path.normcase(n).endswith(_YAML_SUFFIXES)]
             elif config_pattern == 'config.json':
-                found = list(model_path.glob('config.json'))
+                found = [n for n in names if os.path.normcase(n) == 'config.json']
             else:
-                found = list(model_path.glob(config_pattern))
+                found = self._match(config_pattern, names)
             
             if not found:
                 self.warnings.append(f"  No config files found matching '{config_pattern}' in {path_str}")
             else:
-                self.info.append(f"  ✓ Found {len(found)} config file(s) matching '{config_pattern}'")
+                self._note(f"  ✓ Found {len(found)} config file(s) matching '{config_pattern}'")
         
         # Check for .gitkeep (indicates directory is ready for models)
-        if (model_path / '.gitkeep').exists():
-            self.info.append(f"  ℹ Directory has .gitkeep (models will be downloaded here)")
+        if self._has_name(names, '.gitkeep'):
+            self._note(f"  ℹ Directory has .gitkeep (models will be downloaded here)")
         
         return True
     
@@ -140,15 +241,10 @@ class ModelValidator:
             return False
         
         # Check if license is in a known format
-        known_licenses = [
-            'Apache-2.0', 'MIT', 'MPL-2.0', 'GPL', 'LGPL',
-            'NVIDIA Proprietary', 'CC-BY-NC-SA-4.0', 'Tongyi Qianwen'
-        ]
-        
-        if license_str not in known_licenses:
+        if license_str not in _KNOWN_LICENSES:
             self.warnings.append(f"Unknown license format: {license_str} for model {model.get('id')}")
         
-        self.info.append(f"  ✓ License: {license_str}")
+        self._note(f"  ✓ License: {license_str}")
         return True
     
     def validate_wrapper(self, model: Dict) -> bool:
@@ -158,18 +254,19 @@ class ModelValidator:
             self.warnings.append(f"Model {model.get('id', 'unknown')} missing wrapper path")
             return False
         
+        # Wrappers tend to share a directory, so its listing is reused across models
         wrapper_path = self.repo_root / wrapper
-        if not wrapper_path.exists():
+        if not self._has_name(self._get_names(wrapper_path.parent), wrapper_path.name):
             self.warnings.append(f"Wrapper not found: {wrapper} (will be created)")
         else:
-            self.info.append(f"  ✓ Wrapper exists: {wrapper}")
+            self._note(f"  ✓ Wrapper exists: {wrapper}")
         
         return True
     
     def validate_model(self, model: Dict) -> Tuple[bool, bool]:
         """Validate a single model entry."""
         model_id = model.get('id', 'unknown')
-        self.info.append(f"\nValidating model: {model_id}")
+        self._note(f"\nValidating model: {model_id}")
         
         path_ok = self.validate_path(model)
         weights_ok = self.validate_weights(model)
@@ -181,6 +278,16 @@ class ModelValidator:
         
         return not has_errors, not has_warnings
     
+    def _validate_model_threadsafe(
+        self, model: Dict
+    ) -> Tuple[Tuple[bool, bool], List[str], List[str], str]:
+        """Validate one model into private message lists so workers never share them."""
+        worker = ModelValidator(self.manifest_path, self.repo_root)
+        # Listings are shared; two workers missing on the same directory just scan it twice
+        worker._scan_cache = self._scan_cache
+        result = worker.validate_model(model)
+        return result, worker.errors, worker.warnings, worker.info.getvalue()
+    
     def validate_all(self) -> Tuple[int, int]:
         """Validate all models in manifest."""
         manifest = self.load_manifest()
@@ -192,13 +299,20 @@ class ModelValidator:
             self.errors.append("No models found in manifest")
             return 1, 0
         
-        self.info.append(f"Found {len(models)} model(s) in manifest\n")
+        self._note(f"Found {len(models)} model(s) in manifest\n")
         
         error_count = 0
         warning_count = 0
         
-        for model in models:
-            no_errors, no_warnings = self.validate_model(model)
+        # Models are independent and validation is stat-bound, so overlap the I/O;
+        # map() keeps results (and therefore the report) in manifest order
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(models))) as executor:
+            results = list(executor.map(self._validate_model_threadsafe, models))
+        
+        for (no_errors, no_warnings), errors, warnings, info in results:
+            self.errors.extend(errors)
+            self.warnings.extend(warnings)
+            self.info.write(info)
             if not no_errors:
                 error_count += 1
             if not no_warnings:
@@ -212,20 +326,15 @@ class ModelValidator:
         print("MODEL MANIFEST VALIDATION REPORT")
         print("=" * 70)
         
-        if self.info:
-            print("\n[INFO]")
-            for msg in self.info:
-                print(f"  {msg}")
+        # One write per section rather than one print() per line
+        if self.info.tell():
+            sys.stdout.write("\n[INFO]\n" + self.info.getvalue())
         
         if self.warnings:
-            print("\n[WARNINGS]")
-            for msg in self.warnings:
-                print(f"  ⚠ {msg}")
+            sys.stdout.write("\n[WARNINGS]\n" + "".join(f"  ⚠ {msg}\n" for msg in self.warnings))
         
         if self.errors:
-            print("\n[ERRORS]")
-            for msg in self.errors:
-                print(f"  ✗ {msg}")
+            sys.stdout.write("\n[ERRORS]\n" + "".join(f"  ✗ {msg}\n" for msg in self.errors))
         
         print("\n" + "=" * 70)
         
@@ -2,15 +2,63 @@
 # TOOL_MANIFEST: {"name": "Generate Rig", "description": "Create IK rig from selected mesh", "tags": ["rigging", "ik", "ai"], "context_predicates": {"selection": {"type": "mesh"}}, "icon": "target", "required_perms": ["fs:write"], "args": ["mesh_name", "output_path"]}
 
 import sys
+import os
 import json
+import hashlib
+import tempfile
 from pathlib import Path
 
+# Bump when the generated rig layout changes so cached outputs are rebuilt
+RIG_VERSION = 1
+
+
+def _rig_key(mesh_name: str) -> str:
+    """Cache key for a rig: mesh name plus the mesh file's size/mtime if it exists."""
+    parts = [str(RIG_VERSION), mesh_name]
+    mesh_path = Path(mesh_name)
+    if mesh_path.is_file():
+        st = mesh_path.stat()
+        parts += [str(st.st_size), str(st.st_mtime_ns)]
+    return hashlib.blake2b("\0".join(parts).encode(), digest_size=16).hexdigest()
+
+
+def _default_file_mode() -> int:
+    """Mode a plainly created file gets under the current umask (mkstemp uses 0600)."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def _rig_result(output: Path, rig_data: dict, cached: bool) -> dict:
+    return {
+        "success": True,
+        "rig_path": str(output),
+        "bones": len(rig_data["bones"]),
+        "ik_chains": len(rig_data["ik_chains"]),
+        "cached": cached,
+    }
+
+
 def generate_rig(mesh_name: str, output_path: str):
     """
     Generate an IK rig for a mesh.
     This is a placeholder - in production, this would use a neural network
     or procedural generation to create a proper rig.
     """
+    output = Path(output_path)
+    key = _rig_key(mesh_name)
+    
+    # Skip regeneration when the existing output was built from the same input
+    if output.is_file():
+        try:
+            with open(output) as f:
+                existing = json.load(f)
+            if isinstance(existing, dict) and existing.get("_key") == key:
+                print(f"[RigGenerator] Rig up to date: {output_path}")
+                return _rig_result(output, existing, cached=True)
+        except (OSError, ValueError):
+            pass
+    
     print(f"[RigGenerator] Generating rig for: {mesh_name}")
     
     # Simulate rig generation
@@ -26,23 +74,25 @@ def generate_rig(mesh_name: str, output_path: str):
             {"name": "arm_L", "bones": ["shoulder_L"], "target": "hand_L"},
             {"name": "arm_R", "bones": ["shoulder_R"], "target": "hand_R"},
         ],
+        "_key": key,
     }
     
-    # Write to output
-    output = Path(output_path)
+    # Write to output atomically so a reader never sees a partial rig
     output.parent.mkdir(parents=True, exist_ok=True)
     
-    with open(output, "w") as f:
-        json.dump(rig_data, f, indent=2)
+    fd, tmp_path = tempfile.mkstemp(dir=output.parent, prefix=f".{output.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(rig_data, f, separators=(",", ":"))
+        os.chmod(tmp_path, _default_file_mode())
+        os.replace(tmp_path, output)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
     
     print(f"[RigGenerator] Rig saved to: {output_path}")
     
-    return {
-        "success": True,
-        "rig_path": str(output),
-        "bones": len(rig_data["bones"]),
-        "ik_chains": len(rig_data["ik_chains"]),
-    }
+    return _rig_result(output, rig_data, cached=False)
 
 if __name__ == "__main__":
     if len(sys.argv) < 3:
@@ -1,9 +1,11 @@
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, BackgroundTasks, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Set
 import asyncio
-import json
+import orjson
+from contextlib import asynccontextmanager
 from datetime import datetime
 
 # Import services
@@ -12,8 +14,48 @@ from src.backend.services.tools.discovery_bus import discovery
 from src.backend.services.tools.capability_resolver import resolver
 from src.backend.services.tools.agent_executor import executor
 from src.backend.api.models.contracts import ExecuteCommand, MutationIngest
+from src.backend.api.utils.etag_cache import etag_cache
 
-app = FastAPI(title="Zero2oneZ Runtime Agent Launcher")
+# Optional: LiveKit director (resolved once at import, not per request)
+try:
+    from src.backend.services.streaming.livekit_director import get_director
+except ImportError as e:
+    print(f"[API] LiveKit director unavailable: {e}")
+    get_director = None
+
+
+# === Startup/Shutdown ===
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize services on startup and clean them up on shutdown"""
+    print("[API] Starting Zero2oneZ Runtime Agent Launcher...")
+    
+    # Connect to database and start discovery bus concurrently
+    await asyncio.gather(registry.connect(), discovery.start())
+    
+    # Start periodic cleanup task
+    shutdown_event = asyncio.Event()
+    cleanup_task = asyncio.create_task(periodic_cleanup(shutdown_event))
+    
+    print("[API] Services started successfully")
+    
+    yield
+    
+    print("[API] Shutting down...")
+    shutdown_event.set()
+    cleanup_task.cancel()
+    await asyncio.gather(cleanup_task, return_exceptions=True)
+    await asyncio.gather(
+        discovery.stop(), registry.disconnect(), executor.close(), return_exceptions=True
+    )
+
+
+app = FastAPI(
+    title="Zero2oneZ Runtime Agent Launcher",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
 
 # CORS
 app.add_middleware(
@@ -25,7 +67,7 @@ app.add_middleware(
 )
 
 # Active WebSocket connections
-active_connections: List[WebSocket] = []
+active_connections: Set[WebSocket] = set()
 
 
 # === Pydantic Models ===
@@ -41,33 +83,6 @@ class UndoRequest(BaseModel):
     session_id: str
 
 
-# === Startup/Shutdown ===
-
-@app.on_event("startup")
-async def startup():
-    """Initialize services"""
-    print("[API] Starting Zero2oneZ Runtime Agent Launcher...")
-    
-    # Connect to database
-    await registry.connect()
-    
-    # Start discovery bus
-    await discovery.start()
-    
-    # Start periodic cleanup task
-    asyncio.create_task(periodic_cleanup())
-    
-    print("[API] Services started successfully")
-
-
-@app.on_event("shutdown")
-async def shutdown():
-    """Cleanup services"""
-    print("[API] Shutting down...")
-    await discovery.stop()
-    await registry.disconnect()
-
-
 # === Tool Registry Endpoints ===
 
 @app.get("/")
@@ -87,6 +102,7 @@ async def register_tool(tool: Tool):
 
 
 @app.get("/tools/recent", response_model=List[Tool])
+@etag_cache(ttl=2.0)
 async def get_recent_tools(limit: int = 5):
     """Get recently used tools"""
     return await registry.get_recent_tools(limit=limit)
@@ -153,7 +169,7 @@ async def execute_tool(command: ExecuteCommand):
     # Broadcast execution to WebSocket clients
     await broadcast_event({
         "type": "tool_executed",
-        "tool": tool.dict(),
+        "tool": tool.model_dump(mode="json"),
         "result": result,
     })
 
@@ -170,12 +186,13 @@ async def undo_session(request: UndoRequest):
 @app.post("/mutations/ingest", response_model=Dict)
 async def ingest_mutation(payload: MutationIngest):
     """Receive mutation telemetry from renderer"""
+    context = payload.context
     print(
         f"[Mutation] {payload.mutation.type} "
-        f"selection={payload.context.selection_count} "
-        f"space={payload.context.transform_space} "
-        f"snap={payload.context.snap_mode} "
-        f"duration_ms={payload.context.duration_ms:.2f}"
+        f"selection={context['selectionCount']} "
+        f"space={context['transformSpace']} "
+        f"snap={context['snapMode']} "
+        f"duration_ms={context['durationMs']:.2f}"
     )
     return {"success": True}
 
@@ -190,52 +207,78 @@ async def trigger_discovery():
 
 
 @app.get("/discovery/status")
+@etag_cache(ttl=2.0)
 async def discovery_status():
     """Get discovery bus status"""
     return {
         "running": discovery.running,
-        "watched_paths": discovery.observer.emitters if discovery.running else [],
+        "watched_paths": (
+            sorted(emitter.watch.path for emitter in discovery.observer.emitters)
+            if discovery.running else []
+        ),
     }
 
 
 # === WebSocket for Real-Time Updates ===
 
+PONG_MESSAGE = '{"type":"pong"}'
+
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     """Real-time updates (tool executions, discoveries, etc.)"""
     await websocket.accept()
-    active_connections.append(websocket)
+    active_connections.add(websocket)
     
     try:
         while True:
             data = await websocket.receive_text()
-            message = json.loads(data)
+            message = orjson.loads(data)
             
             # Handle client messages (if needed)
-            if message.get("type") == "ping":
-                await websocket.send_json({"type": "pong"})
+            if isinstance(message, dict) and message.get("type") == "ping":
+                await websocket.send_text(PONG_MESSAGE)
     
     except WebSocketDisconnect:
-        active_connections.remove(websocket)
+        active_connections.discard(websocket)
         print("[WS] Client disconnected")
 
 
 async def broadcast_event(event: Dict):
     """Broadcast event to all WebSocket clients"""
-    for connection in active_connections:
-        try:
-            await connection.send_json(event)
-        except:
-            active_connections.remove(connection)
+    # Serialize once for every client rather than once per send_json call
+    payload = orjson.dumps(event).decode()
+    
+    # Snapshot so disconnects during the fan-out can't mutate what we iterate
+    connections = list(active_connections)
+    results = await asyncio.gather(
+        *(connection.send_text(payload) for connection in connections),
+        return_exceptions=True,
+    )
+    for connection, result in zip(connections, results):
+        if isinstance(result, Exception):
+            active_connections.discard(connection)
 
 
 # === Background Tasks ===
 
-async def periodic_cleanup():
-    """Periodic cleanup of expired tools"""
-    while True:
-        await asyncio.sleep(3600)  # Run every hour
-        await registry.cleanup_expired()
+CLEANUP_INTERVAL_S = 3600  # Run every hour
+
+
+async def periodic_cleanup(shutdown_event: asyncio.Event):
+    """Periodic cleanup of expired tools until shutdown_event is set"""
+    loop = asyncio.get_running_loop()
+    next_run = loop.time() + CLEANUP_INTERVAL_S
+    while not shutdown_event.is_set():
+        try:
+            # Wait against a fixed schedule so cleanup time doesn't accumulate drift
+            await asyncio.wait_for(shutdown_event.wait(), timeout=max(0.0, next_run - loop.time()))
+        except asyncio.TimeoutError:
+            next_run += CLEANUP_INTERVAL_S
+            try:
+                await registry.cleanup_expired()
+            except Exception as e:
+                print(f"[API] Periodic cleanup failed: {e}")
 
 
 # === LiveKit Director Endpoints ===
@@ -244,11 +287,8 @@ async def periodic_cleanup():
 async def get_livekit_telemetry(camera_id: str):
     """Get telemetry overlay for camera."""
     try:
-        import sys
-        from pathlib import Path
-        sys.path.insert(0, str(Path(__file__).parent.parent / "services"))
-        from livekit_director import get_director
-        
+        if get_director is None:
+            raise RuntimeError("LiveKit director is not available")
         director = get_director()
         telemetry = director.get_telemetry_overlay(camera_id)
         return telemetry
@@ -260,11 +300,8 @@ async def get_livekit_telemetry(camera_id: str):
 async def switch_camera(camera_id: str):
     """Switch to a different camera."""
     try:
-        import sys
-        from pathlib import Path
-        sys.path.insert(0, str(Path(__file__).parent.parent / "services"))
-        from livekit_director import get_director
-        
+        if get_director is None:
+            raise RuntimeError("LiveKit director is not available")
         director = get_director()
         selected = await director.auto_direct()
         return {"success": True, "selected_camera": selected}
@@ -670,5 +707,18 @@ async def health_check():
 
 
 if __name__ == "__main__":
+    import os
+    import sys
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000, log_level="info")
+    
+    # NOTE: active_connections is process-local, so WebSocket broadcasts only
+    # reach clients of the same worker; keep WORKERS=1 unless that changes.
+    uvicorn.run(
+        "src.backend.api.main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        workers=int(os.environ.get("WORKERS", "1")),
+        log_level="info",
+    )
@@ -1,6 +1,8 @@
-from typing import Any, Dict, List, Optional
+from typing import Annotated, Any, Dict, List, Optional
 from datetime import datetime
-from pydantic import BaseModel, Field, field_validator
+from functools import lru_cache
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from typing_extensions import TypedDict
 
 
 class TransformCapabilities(BaseModel):
@@ -24,14 +26,13 @@ class ToolManifest(BaseModel):
 
 
 class ExecuteCommandPayload(BaseModel):
+    model_config = ConfigDict(populate_by_name=True, frozen=True)
+
     transform: Optional[Dict[str, Any]] = None
     pivot: Optional[Dict[str, Any]] = None
     targetId: Optional[str] = Field(default=None, alias="target_id")
     options: Dict[str, Any] = Field(default_factory=dict)
 
-    class Config:
-        populate_by_name = True
-
 
 class ExecuteCommand(BaseModel):
     tool_id: str
@@ -42,14 +43,24 @@ class ExecuteCommand(BaseModel):
     user_approved: bool = False
 
 
-class MutationDelta(BaseModel):
-    transform: Optional[Dict[str, Any]] = None
-    pivot: Optional[Dict[str, Any]] = None
-    parentId: Optional[str] = Field(default=None, alias="parent_id")
-    snap: Optional[Dict[str, Any]] = None
+# MutationDelta/MutationContext only ever arrive inside MutationIngest, so they
+# are TypedDicts (validated into plain dicts, keyed by field name) rather than
+# models of their own.
+class MutationDelta(TypedDict, total=False):
+    __pydantic_config__ = ConfigDict(populate_by_name=True)
+
+    transform: Optional[Dict[str, Any]]
+    pivot: Optional[Dict[str, Any]]
+    parentId: Annotated[Optional[str], Field(alias="parent_id")]
+    snap: Optional[Dict[str, Any]]
+
 
-    class Config:
-        populate_by_name = True
+@lru_cache(maxsize=4096)
+def _ts_from_epoch(value: float) -> datetime:
+    """Epoch seconds or milliseconds -> datetime (cached: bursts share timestamps)"""
+    if value > 10_000_000_000:  # assume milliseconds
+        return datetime.fromtimestamp(value / 1000.0)
+    return datetime.fromtimestamp(value)
 
 
 class MutationRecord(BaseModel):
@@ -65,21 +76,18 @@ class MutationRecord(BaseModel):
     @classmethod
     def _parse_ts(cls, value):
         if isinstance(value, (int, float)):
-            if value > 10_000_000_000:  # assume milliseconds
-                return datetime.fromtimestamp(value / 1000.0)
-            return datetime.fromtimestamp(value)
+            return _ts_from_epoch(value)
         return value
 
 
-class MutationContext(BaseModel):
-    selectionCount: int = Field(alias="selection_count")
-    transformSpace: str = Field(alias="transform_space")
-    snapMode: str = Field(alias="snap_mode")
-    undoDepth: int = Field(alias="undo_depth")
-    durationMs: float = Field(alias="duration_ms")
+class MutationContext(TypedDict):
+    __pydantic_config__ = ConfigDict(populate_by_name=True)
 
-    class Config:
-        populate_by_name = True
+    selectionCount: Annotated[int, Field(alias="selection_count")]
+    transformSpace: Annotated[str, Field(alias="transform_space")]
+    snapMode: Annotated[str, Field(alias="snap_mode")]
+    undoDepth: Annotated[int, Field(alias="undo_depth")]
+    durationMs: Annotated[float, Field(alias="duration_ms")]
 
 
 class MutationIngest(BaseModel):
@@ -0,0 +1,82 @@
+"""
+ETag Response Cache
+
+Short-lived in-memory cache for frequently polled GET endpoints. Repeat polls
+within the TTL skip the handler entirely, and clients that send a matching
+If-None-Match header get an empty 304 instead of the body.
+"""
+
+import asyncio
+import functools
+import hashlib
+import inspect
+from typing import Any, Callable, Dict, Tuple
+
+import orjson
+from cachetools import TTLCache
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Check an If-None-Match header value against an ETag."""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+def etag_cache(ttl: float = 2.0, maxsize: int = 256) -> Callable:
+    """
+    Cache a GET handler's JSON body for `ttl` seconds and attach a weak ETag.
+
+    The cache key is the handler's query/path arguments. The handler must be
+    async and called with keyword arguments only (as FastAPI does).
+    Concurrent misses for the same key share one handler call.
+
+    Args:
+        ttl: Seconds a cached body is served before the handler runs again
+        maxsize: Most distinct argument sets kept; keys come from client
+            query strings, so the cache is bounded
+    """
+    def decorator(func: Callable) -> Callable:
+        cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        # key -> task rendering that key, awaited by every concurrent miss
+        inflight: Dict[Tuple, asyncio.Task] = {}
+
+        async def render(key: Tuple, kwargs: Dict[str, Any]) -> Tuple[bytes, str]:
+            try:
+                body = orjson.dumps(jsonable_encoder(await func(**kwargs)))
+                etag = f'W/"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+                cache[key] = (body, etag)
+                return body, etag
+            finally:
+                inflight.pop(key, None)
+
+        @functools.wraps(func)
+        async def wrapper(request: Request, **kwargs: Any) -> Response:
+            key = tuple(sorted(kwargs.items()))
+
+            entry = cache.get(key)
+            if entry is None:
+                task = inflight.get(key)
+                if task is None:
+                    task = inflight[key] = asyncio.ensure_future(render(key, kwargs))
+                # Shielded: one client disconnecting doesn't cancel the others' render
+                entry = await asyncio.shield(task)
+
+            body, etag = entry
+            if _etag_matches(request.headers.get("if-none-match", ""), etag):
+                return Response(status_code=304, headers={"ETag": etag})
+            return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+        # Expose the original parameters plus `request` so FastAPI injects both
+        params = [
+            p.replace(kind=inspect.Parameter.KEYWORD_ONLY)
+            for p in inspect.signature(func).parameters.values()
+        ]
+        request_param = inspect.Parameter("request", inspect.Parameter.KEYWORD_ONLY, annotation=Request)
+        wrapper.__signature__ = inspect.Signature([request_param, *params])
+        return wrapper
+
+    return decorator
@@ -4,46 +4,179 @@ Port Management Utility
 Provides port rotation fail-safe functionality for all services.
 """
 
+import random
 import socket
-from typing import Optional
+import sys
+import threading
+from typing import Optional, Set
+
+from cachetools import TTLCache
+
+# Ports that recently failed to bind, keyed by (host, port). Rapid retries
+# (e.g. several services starting at once) skip them instead of re-probing.
+_busy_ports: TTLCache = TTLCache(maxsize=256, ttl=5)
+_busy_lock = threading.Lock()
+
+
+# Ports recently handed out by randomized scans. Concurrent spawns skip them
+# even before the new owner has bound; entries expire in case a caller never
+# calls release_port().
+_allocated_ports: TTLCache = TTLCache(maxsize=1024, ttl=30)
+
+
+def _is_known_busy(host: str, port: int) -> bool:
+    with _busy_lock:
+        return (host, port) in _busy_ports
+
+
+def _mark_busy(host: str, port: int) -> None:
+    with _busy_lock:
+        _busy_ports[(host, port)] = True
+
+
+def _claim(port: int) -> bool:
+    """Reserve a port for this process; False if another caller already holds it."""
+    with _busy_lock:
+        if port in _allocated_ports:
+            return False
+        _allocated_ports[port] = True
+        return True
+
+
+def release_port(port: int) -> None:
+    """Return a port handed out by find_available_port/find_available_socket."""
+    with _busy_lock:
+        _allocated_ports.pop(port, None)
+
+
+# /proc/net/tcp{,6} state code for LISTEN
+_TCP_LISTEN = '0A'
+
+
+def _listening_ports_linux() -> Set[int]:
+    """
+    All TCP ports in LISTEN state, read from /proc/net/tcp and /proc/net/tcp6.
+    
+    Returns an empty set off Linux or when procfs is unavailable, in which
+    case callers fall back to probing with bind().
+    """
+    ports: Set[int] = set()
+    if sys.platform != 'linux':
+        return ports
+    for table in ('/proc/net/tcp', '/proc/net/tcp6'):
+        try:
+            with open(table, 'r') as f:
+                next(f, None)  # header
+                for line in f:
+                    fields = line.split()
+                    if len(fields) > 3 and fields[3] == _TCP_LISTEN:
+                        ports.add(int(fields[1].rsplit(':', 1)[1], 16))
+        except (OSError, ValueError):
+            continue
+    return ports
 
 
 def is_port_available(port: int, host: str = 'localhost') -> bool:
     """Check if a port is available."""
+    if _is_known_busy(host, port):
+        return False
     try:
         with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
             s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            result = s.bind((host, port))
+            s.bind((host, port))
             return True
     except OSError:
+        _mark_busy(host, port)
         return False
 
 
-def find_available_port(start_port: int = 8000, max_attempts: int = 100, host: str = 'localhost') -> int:
+def find_available_socket(
+    start_port: int = 8000,
+    max_attempts: int = 100,
+    host: str = 'localhost',
+    randomize: bool = False,
+) -> socket.socket:
     """
-    Find an available port starting from start_port.
+    Bind a TCP socket to the first available port starting from start_port.
+    
+    The socket is returned still bound, so the caller can listen() on it (or
+    hand it to a server) without the port being taken between the check and
+    the real bind. The caller owns the socket and must close it.
     
     Args:
         start_port: Starting port number
         max_attempts: Maximum number of ports to try
         host: Host to bind to (default: localhost)
+        randomize: For concurrent allocators: start the scan at a random
+            port in the range (wrapping around) and reserve the result in
+            this process until release_port(), so callers don't all contend
+            for start_port or get handed the same port
     
     Returns:
-        Available port number
+        Bound socket; use getsockname()[1] for the port
     
     Raises:
         RuntimeError: If no available port found
     """
+    # One procfs read rules out every listening port up front, so bind() is
+    # normally attempted only once
+    listening = _listening_ports_linux()
+    
+    # One socket for the whole scan: a failed bind leaves it unbound and reusable
+    s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    offset = random.randrange(max_attempts) if randomize and max_attempts > 0 else 0
     for i in range(max_attempts):
-        port = start_port + i
-        if is_port_available(port, host):
-            return port
+        port = start_port + (offset + i) % max_attempts
+        if port in listening or _is_known_busy(host, port):
+            continue
+        if randomize and not _claim(port):
+            continue
+        try:
+            s.bind((host, port))
+            return s
+        except OSError:
+            if randomize:
+                release_port(port)
+            _mark_busy(host, port)
+    s.close()
     
     raise RuntimeError(
         f"No available ports found in range {start_port}-{start_port + max_attempts - 1}"
     )
 
 
+def find_available_port(
+    start_port: int = 8000,
+    max_attempts: int = 100,
+    host: str = 'localhost',
+    randomize: bool = False,
+) -> int:
+    """
+    Find an available port starting from start_port.
+    
+    Prefer find_available_socket when the caller can take a bound socket;
+    a port returned here may be taken again before the caller binds it.
+    With randomize, the port also stays reserved within this process until
+    release_port() (or a short timeout), so concurrent callers are not handed
+    the same one.
+    
+    Args:
+        start_port: Starting port number
+        max_attempts: Maximum number of ports to try
+        host: Host to bind to (default: localhost)
+        randomize: Random start within the range plus in-process reservation
+    
+    Returns:
+        Available port number
+    
+    Raises:
+        RuntimeError: If no available port found
+    """
+    with find_available_socket(start_port, max_attempts, host, randomize) as s:
+        return s.getsockname()[1]
+
+
 def get_port_or_raise(port: Optional[int] = None, start_port: int = 8000, max_attempts: int = 100) -> int:
     """
     Get a port, using provided port if available, otherwise finding an available one.
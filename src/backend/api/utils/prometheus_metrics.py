@@ -5,9 +5,31 @@ Provides Prometheus metrics for all services.
 """
 
 from prometheus_client import Counter, Histogram, Gauge, start_http_server
+from functools import lru_cache
 from typing import Optional
+import re
 import time
 
+# Label values must come from small, bounded sets: every distinct value is a
+# separate time series. Raw paths and tool ids belong in logs/traces instead.
+
+# Path segments that are ids (numbers, UUIDs, long hex) collapse to "{id}"
+_ID_SEGMENT = re.compile(
+    r"^(\d+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}|[0-9a-fA-F]{16,})$"
+)
+
+
+@lru_cache(maxsize=4096)
+def normalize_endpoint(path: str) -> str:
+    """Turn a concrete request path into a route template (/tools/42 -> /tools/{id})."""
+    path = path.split("?", 1)[0]
+    return "/".join("{id}" if _ID_SEGMENT.match(part) else part for part in path.split("/"))
+
+
+# Histogram buckets (seconds) matched to each workload's latency range
+HTTP_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5)
+TASK_BUCKETS = (0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30)  # tool runs, agent spawns
+
 
 # Request metrics
 request_count = Counter(
@@ -19,7 +41,8 @@ request_count = Counter(
 request_duration = Histogram(
     'http_request_duration_seconds',
     'HTTP request duration',
-    ['method', 'endpoint']
+    ['method', 'endpoint'],
+    buckets=HTTP_BUCKETS
 )
 
 # GPU metrics
@@ -45,20 +68,22 @@ agent_instances = Gauge(
 agent_spawn_duration = Histogram(
     'agent_spawn_duration_seconds',
     'Agent spawn duration',
-    ['agent_type']
+    ['agent_type'],
+    buckets=TASK_BUCKETS
 )
 
 # Tool execution metrics
 tool_executions = Counter(
     'tool_executions_total',
     'Total tool executions',
-    ['tool_id', 'status']
+    ['tool_category', 'status']
 )
 
 tool_execution_duration = Histogram(
     'tool_execution_duration_seconds',
     'Tool execution duration',
-    ['tool_id']
+    ['tool_category'],
+    buckets=TASK_BUCKETS
 )
 
 # Emotion fusion metrics
@@ -76,6 +101,27 @@ error_count = Counter(
 )
 
 
+# Bound children per label tuple, so the record_* hot path skips labels()
+@lru_cache(maxsize=4096)
+def _request_count(method: str, endpoint: str, status: int):
+    return request_count.labels(method=method, endpoint=endpoint, status=status)
+
+
+@lru_cache(maxsize=4096)
+def _request_duration(method: str, endpoint: str):
+    return request_duration.labels(method=method, endpoint=endpoint)
+
+
+@lru_cache(maxsize=256)
+def _tool_executions(tool_category: str, status: str):
+    return tool_executions.labels(tool_category=tool_category, status=status)
+
+
+@lru_cache(maxsize=256)
+def _tool_execution_duration(tool_category: str):
+    return tool_execution_duration.labels(tool_category=tool_category)
+
+
 def start_metrics_server(port: int = 9091):
     """Start Prometheus metrics server."""
     start_http_server(port)
@@ -84,8 +130,14 @@ def start_metrics_server(port: int = 9091):
 
 def record_request(method: str, endpoint: str, status: int, duration: float):
     """Record HTTP request metrics."""
-    request_count.labels(method=method, endpoint=endpoint, status=status).inc()
-    request_duration.labels(method=method, endpoint=endpoint).observe(duration)
+    endpoint = normalize_endpoint(endpoint)
+    _request_count(method, endpoint, status).inc()
+    _request_duration(method, endpoint).observe(duration)
+
+
+def time_request(method: str, endpoint: str):
+    """Context manager that observes an HTTP request's duration."""
+    return _request_duration(method, normalize_endpoint(endpoint)).time()
 
 
 def record_gpu_usage(gpu_id: int, utilization: float, memory_mb: int):
@@ -100,10 +152,20 @@ def record_agent_spawn(agent_type: str, duration: float, success: bool):
     agent_instances.labels(status='running' if success else 'error').inc()
 
 
-def record_tool_execution(tool_id: str, duration: float, success: bool):
-    """Record tool execution metrics."""
-    tool_executions.labels(tool_id=tool_id, status='success' if success else 'error').inc()
-    tool_execution_duration.labels(tool_id=tool_id).observe(duration)
+def time_agent_spawn(agent_type: str):
+    """Context manager that observes an agent spawn's duration."""
+    return agent_spawn_duration.labels(agent_type=agent_type).time()
+
+
+def record_tool_execution(tool_category: str, duration: float, success: bool):
+    """Record tool execution metrics (by category, e.g. a radial menu category)."""
+    _tool_executions(tool_category, 'success' if success else 'error').inc()
+    _tool_execution_duration(tool_category).observe(duration)
+
+
+def time_tool_execution(tool_category: str):
+    """Context manager that observes a tool execution's duration."""
+    return _tool_execution_duration(tool_category).time()
 
 
 def record_emotion_update(emotion_type: str):
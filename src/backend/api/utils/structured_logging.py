@@ -4,25 +4,68 @@ Structured Logging Utility
 Provides structured JSON logging with Jaeger trace integration.
 """
 
+import atexit
+import copy
 import json
 import logging
+import queue
 import sys
-from datetime import datetime
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from datetime import datetime, timezone
 from typing import Dict, Any, Optional
 from contextvars import ContextVar
 
+try:
+    import orjson
+except ImportError:  # fall back to stdlib json
+    orjson = None
+
 # Context variable for trace ID
 trace_id_var: ContextVar[Optional[str]] = ContextVar('trace_id', default=None)
 span_id_var: ContextVar[Optional[str]] = ContextVar('span_id', default=None)
 
 
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat().replace("+00:00", "Z")
+    return str(value)
+
+
+if orjson is not None:
+    def _dumps(data: Dict[str, Any]) -> str:
+        return orjson.dumps(data, default=str, option=orjson.OPT_UTC_Z).decode("utf-8")
+else:
+    def _dumps(data: Dict[str, Any]) -> str:
+        return json.dumps(data, default=_json_default)
+
+
 class StructuredFormatter(logging.Formatter):
     """JSON formatter for structured logging."""
     
+    # (whole second, "YYYY-MM-DDTHH:MM:SS") of the last record; bursts within
+    # one second reuse the formatted prefix and only append the microseconds
+    _second_cache = (None, "")
+    
+    def _timestamp(self, created: float) -> str:
+        second = int(created)
+        cached_second, prefix = self._second_cache
+        if second != cached_second:
+            prefix = datetime.fromtimestamp(second, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+            self._second_cache = (second, prefix)
+        return f"{prefix}.{int((created - second) * 1_000_000):06d}Z"
+    
     def format(self, record: logging.LogRecord) -> str:
         """Format log record as JSON."""
+        # Records from the queue carry the context captured by the producer
+        if hasattr(record, "trace_id"):
+            trace_id, span_id = record.trace_id, record.span_id
+        else:
+            trace_id, span_id = trace_id_var.get(), span_id_var.get()
+        
+        # record.created is when the record was made; no second clock read
         log_data = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": self._timestamp(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -32,8 +75,6 @@ class StructuredFormatter(logging.Formatter):
         }
         
         # Add trace context
-        trace_id = trace_id_var.get()
-        span_id = span_id_var.get()
         if trace_id:
             log_data["trace_id"] = trace_id
         if span_id:
@@ -44,10 +85,72 @@ class StructuredFormatter(logging.Formatter):
             log_data["exception"] = self.formatException(record.exc_info)
         
         # Add extra fields
-        if hasattr(record, 'extra'):
-            log_data.update(record.extra)
+        extra = getattr(record, 'extra', None)
+        if extra:
+            log_data.update(extra)
         
-        return json.dumps(log_data, default=str)
+        return _dumps(log_data)
+
+
+LOG_QUEUE_SIZE = 10000
+
+
+class _ContextQueueHandler(QueueHandler):
+    """
+    Queue handler that snapshots the trace context (ContextVars are not visible
+    from the listener thread) and drops records when the queue is full rather
+    than blocking the caller.
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        record.trace_id = trace_id_var.get()
+        record.span_id = span_id_var.get()
+        return record
+    
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
+class _BatchingStreamHandler(logging.StreamHandler):
+    """
+    Stream handler for the listener thread that only flushes once the queue is
+    drained, so a burst of records goes out in a few large writes instead of
+    one syscall per line.
+    """
+    
+    def __init__(self, stream, log_queue: queue.Queue):
+        super().__init__(stream)
+        self._log_queue = log_queue
+    
+    def flush(self):
+        if self._log_queue.empty():
+            super().flush()
+
+
+_queue_handler: Optional[_ContextQueueHandler] = None
+_listener: Optional[QueueListener] = None
+_listener_lock = threading.Lock()
+
+
+def _get_queue_handler() -> _ContextQueueHandler:
+    """Shared queue handler; JSON formatting and stdout writes run on the listener thread."""
+    global _queue_handler, _listener
+    with _listener_lock:
+        if _queue_handler is None:
+            log_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+            handler = _BatchingStreamHandler(sys.stdout, log_queue)
+            handler.setFormatter(StructuredFormatter())
+            _listener = QueueListener(log_queue, handler)
+            _listener.start()
+            atexit.register(_listener.stop)
+            _queue_handler = _ContextQueueHandler(log_queue)
+        return _queue_handler
 
 
 class StructuredLogger:
@@ -56,11 +159,13 @@ class StructuredLogger:
     def __init__(self, name: str, level: int = logging.INFO):
         self.logger = logging.getLogger(name)
         self.logger.setLevel(level)
+        # The JSON handler is the only output; don't also emit via root handlers
+        self.logger.propagate = False
         
-        # Add JSON formatter
-        handler = logging.StreamHandler(sys.stdout)
-        handler.setFormatter(StructuredFormatter())
-        self.logger.addHandler(handler)
+        # Add JSON handler (queued; once per logger)
+        handler = _get_queue_handler()
+        if handler not in self.logger.handlers:
+            self.logger.addHandler(handler)
     
     def set_trace_id(self, trace_id: str):
         """Set trace ID for current context."""
@@ -72,23 +177,33 @@ class StructuredLogger:
     
     def info(self, message: str, **kwargs):
         """Log info message."""
-        self.logger.info(message, extra=kwargs)
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(message, extra=kwargs)
     
     def error(self, message: str, **kwargs):
         """Log error message."""
-        self.logger.error(message, extra=kwargs)
+        if self.logger.isEnabledFor(logging.ERROR):
+            self.logger.error(message, extra=kwargs)
     
     def warning(self, message: str, **kwargs):
         """Log warning message."""
-        self.logger.warning(message, extra=kwargs)
+        if self.logger.isEnabledFor(logging.WARNING):
+            self.logger.warning(message, extra=kwargs)
     
     def debug(self, message: str, **kwargs):
         """Log debug message."""
-        self.logger.debug(message, extra=kwargs)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(message, extra=kwargs)
+
+
+_loggers: Dict[str, StructuredLogger] = {}
 
 
 def get_logger(name: str) -> StructuredLogger:
-    """Get structured logger instance."""
-    return StructuredLogger(name)
+    """Get structured logger instance (one per name)."""
+    logger = _loggers.get(name)
+    if logger is None:
+        logger = _loggers.setdefault(name, StructuredLogger(name))
+    return logger
 
 
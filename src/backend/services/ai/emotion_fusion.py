@@ -6,9 +6,8 @@ Combines SER (Speech Emotion Recognition) and FER (Face Emotion Recognition) out
 """
 
 import asyncio
+import time
 from typing import Dict, List, Optional, Tuple
-from collections import deque
-import numpy as np
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 
@@ -20,8 +19,13 @@ class EmotionState:
     confidence: float
     arousal: float  # -1 to 1
     valence: float  # -1 to 1
-    timestamp: datetime
+    timestamp_ns: int  # Wall-clock time.time_ns(); see `timestamp`
     sources: Dict[str, float]  # Source confidence scores
+    
+    @property
+    def timestamp(self) -> datetime:
+        """Fusion time as a datetime, built only when someone asks for it."""
+        return datetime.fromtimestamp(self.timestamp_ns / 1e9)
 
 
 class EmotionFusion:
@@ -37,7 +41,7 @@ class EmotionFusion:
         ser_weight: float = 0.6,  # Weight for speech emotion
         fer_weight: float = 0.4,  # Weight for face emotion
         omnivinci_weight: float = 0.5,  # Weight for OmniVinci (context-aware)
-        window_size: int = 10  # Window size for smoothing
+        window_size: int = 10  # Kept for API compatibility; fusion uses the latest result per source
     ):
         self.alpha = alpha
         self.ser_weight = ser_weight
@@ -45,10 +49,11 @@ class EmotionFusion:
         self.omnivinci_weight = omnivinci_weight
         self.window_size = window_size
         
-        # State tracking
-        self.ser_history: deque = deque(maxlen=window_size)
-        self.fer_history: deque = deque(maxlen=window_size)
-        self.omnivinci_history: deque = deque(maxlen=window_size)
+        # State tracking: fuse() only ever reads the newest result per source,
+        # so each add overwrites instead of appending to a history window
+        self._ser_latest: Optional[Dict] = None
+        self._fer_latest: Optional[Dict] = None
+        self._omnivinci_latest: Optional[Dict] = None
         self.fused_state: Optional[EmotionState] = None
         
         # Emotion mapping (from arousal/valence to emotion labels)
@@ -61,43 +66,50 @@ class EmotionFusion:
             "disgust": (-0.3, -0.7),
             "neutral": (0.0, 0.0),
         }
+        # (label, arousal, valence) triples for classification; for a map this
+        # small a plain min() beats a NumPy round-trip (no array allocation)
+        self._emotion_items = tuple(
+            (label, a, v) for label, (a, v) in self.emotion_map.items()
+        )
     
     def add_ser_result(self, emotion: str, confidence: float, arousal: float, valence: float):
         """Add SER (Speech Emotion Recognition) result."""
-        self.ser_history.append({
+        self._ser_latest = {
             "emotion": emotion,
             "confidence": confidence,
             "arousal": arousal,
             "valence": valence,
-            "timestamp": datetime.now()
-        })
+            "timestamp_ns": time.time_ns()
+        }
     
     def add_fer_result(self, emotion: str, confidence: float):
         """Add FER (Face Emotion Recognition) result."""
         # Map emotion to arousal/valence (simplified)
         arousal, valence = self._emotion_to_av(emotion)
         
-        self.fer_history.append({
+        self._fer_latest = {
             "emotion": emotion,
             "confidence": confidence,
             "arousal": arousal,
             "valence": valence,
-            "timestamp": datetime.now()
-        })
+            "timestamp_ns": time.time_ns()
+        }
     
     def add_omnivinci_result(self, emotion: str, confidence: float, arousal: float, valence: float):
         """Add OmniVinci (multimodal context-aware) result."""
-        self.omnivinci_history.append({
+        self._omnivinci_latest = {
             "emotion": emotion,
             "confidence": confidence,
             "arousal": arousal,
             "valence": valence,
-            "timestamp": datetime.now()
-        })
+            "timestamp_ns": time.time_ns()
+        }
     
     def _emotion_to_av(self, emotion: str) -> Tuple[float, float]:
         """Map emotion label to arousal/valence coordinates."""
-        return self.emotion_map.get(emotion.lower(), (0.0, 0.0))
+        # Model outputs are usually lowercase already; only lower() on a miss
+        av = self.emotion_map.get(emotion)
+        return av if av is not None else self.emotion_map.get(emotion.lower(), (0.0, 0.0))
     
     def fuse(self) -> Optional[EmotionState]:
         """
@@ -106,13 +118,13 @@ class EmotionFusion:
         Returns:
             Unified emotion state or None if no data available
         """
-        if not self.ser_history and not self.fer_history and not self.omnivinci_history:
-            return None
-        
         # Get latest results
-        ser_latest = self.ser_history[-1] if self.ser_history else None
-        fer_latest = self.fer_history[-1] if self.fer_history else None
-        omnivinci_latest = self.omnivinci_history[-1] if self.omnivinci_history else None
+        ser_latest = self._ser_latest
+        fer_latest = self._fer_latest
+        omnivinci_latest = self._omnivinci_latest
+        
+        if not ser_latest and not fer_latest and not omnivinci_latest:
+            return None
         
         # Calculate weighted arousal/valence
         arousal = 0.0
@@ -172,7 +184,7 @@ class EmotionFusion:
             confidence=confidence,
             arousal=arousal,
             valence=valence,
-            timestamp=datetime.now(),
+            timestamp_ns=time.time_ns(),
             sources=sources
         )
         
@@ -183,20 +195,11 @@ class EmotionFusion:
     
     def _av_to_emotion(self, arousal: float, valence: float) -> str:
         """Map arousal/valence coordinates to emotion label."""
-        # Find closest emotion in A-V space
-        min_dist = float('inf')
-        closest_emotion = "neutral"
-        
-        for emotion, (target_arousal, target_valence) in self.emotion_map.items():
-            dist = np.sqrt(
-                (arousal - target_arousal) ** 2 +
-                (valence - target_valence) ** 2
-            )
-            if dist < min_dist:
-                min_dist = dist
-                closest_emotion = emotion
-        
-        return closest_emotion
+        # Find closest emotion in A-V space (squared distance ranks the same as distance)
+        return min(
+            self._emotion_items,
+            key=lambda t: (arousal - t[1]) * (arousal - t[1]) + (valence - t[2]) * (valence - t[2])
+        )[0]
     
     def get_current_state(self) -> Optional[EmotionState]:
         """Get current fused emotion state."""
@@ -204,9 +207,9 @@ class EmotionFusion:
     
     def reset(self):
         """Reset fusion state."""
-        self.ser_history.clear()
-        self.fer_history.clear()
-        self.omnivinci_history.clear()
+        self._ser_latest = None
+        self._fer_latest = None
+        self._omnivinci_latest = None
         self.fused_state = None
 
 
@@ -1,44 +1,113 @@
 """
-Facebook Models Swarm with Round-Robin
+Facebook Models Swarm with Load-Aware Dispatch
 
-Arrange Facebook models in a swarm with round-robin distribution.
+Arrange Facebook models in a swarm: models are placed on devices round-robin,
+and each request goes to the node with the lowest estimated completion time.
+Concurrent async requests to a node can be micro-batched into one forward pass.
 """
 
 import asyncio
-from typing import List, Dict, Optional, Any
-from dataclasses import dataclass
+import os
+import time
+from typing import List, Dict, Optional, Any, Tuple
+from dataclasses import dataclass, field
 from datetime import datetime
+import queue
 import threading
-from collections import deque
+from collections import deque, OrderedDict
+from contextlib import contextmanager, nullcontext
 import torch
 
 
+# Smoothing for per-node latency estimates (weight of the newest sample)
+LATENCY_EWMA_ALPHA = 0.2
+
+# Request types whose outputs are a per-sample feature tensor and so can be
+# stacked into one forward pass and split back per requester
+BATCHABLE_TYPES = frozenset({'audio', 'text', 'vision'})
+
+
+@dataclass
+class ModelReplica:
+    """One loaded copy of a node's model."""
+    model: Any  # _load_facebook_model() output: model, processor, device, input_dtype
+    # torch.cuda.Stream this copy computes on (CUDA nodes), so replicas sharing
+    # a device overlap on the GPU instead of serializing on its default stream
+    stream: Optional[Any] = None
+    # input signature -> (CUDAGraph, static inputs, static outputs), or None if
+    # capture failed for that signature; least recently used first. Per replica,
+    # since a captured graph is bound to one copy's weights and static buffers.
+    graphs: "OrderedDict[Tuple, Any]" = field(default_factory=OrderedDict)
+    # Signatures run once so far (eager); captured only if they come back
+    seen_once: "OrderedDict[Tuple, None]" = field(default_factory=OrderedDict)
+    graph_lock: threading.Lock = field(default_factory=threading.Lock)
+
+
 @dataclass
 class ModelNode:
     """Model node in swarm."""
     model_id: str
     model_path: str
     device: str
-    model: Any
+    model: Any  # first replica's model data
     load_time: float
     status: str  # 'idle', 'busy', 'error'
     request_count: int = 0
+    inflight: int = 0  # requests dispatched to this node and not yet finished
+    ewma_latency: float = 0.0  # seconds; 0 until the first request completes
+    weight: float = 1.0  # device capacity prior (SM count / CPU cores), breaks ties
+    # Guards this node's inflight/ewma/status updates only; selection never
+    # takes it, so dispatches to different nodes don't contend
+    stats_lock: threading.Lock = field(default_factory=threading.Lock)
+    torch_device: Optional[torch.device] = None  # parsed once from `device`
+    is_cuda: bool = False
+    memcpy_stream: Optional[Any] = None  # torch.cuda.Stream for H2D copies (CUDA nodes)
+    input_dtype: Optional[torch.dtype] = None  # float inputs are cast to this (reduced-precision CUDA nodes)
+    # Copies of the model on this device; each runs one request at a time, and
+    # idle_replicas hands them out (blocking when all are busy)
+    replicas: List[ModelReplica] = field(default_factory=list)
+    idle_replicas: "queue.SimpleQueue[ModelReplica]" = field(default_factory=queue.SimpleQueue)
+    # input name -> (flat pinned host buffer, event marking its last H2D copy)
+    staging: Dict[str, Any] = field(default_factory=dict)
+    staging_lock: threading.Lock = field(default_factory=threading.Lock)
+    # (input, model_type, future) awaiting the node's batcher; created on the
+    # first async request and bound to that event loop until close()
+    batch_queue: Optional[asyncio.Queue] = None
+    batcher: Optional[asyncio.Task] = None
 
 
 class FacebookModelSwarm:
-    """Swarm of Facebook models with round-robin distribution."""
+    """Swarm of Facebook models with load-aware request distribution."""
     
     def __init__(
         self,
         model_configs: List[Dict],
-        devices: Optional[List[str]] = None
+        devices: Optional[List[str]] = None,
+        use_cuda_graphs: bool = False,
+        max_graphs_per_node: int = 8,
+        quantize: bool = False,
+        batch_size: int = 1,
+        max_batch_delay_ms: float = 5.0
     ):
         self.model_configs = model_configs
         self.devices = devices or self._get_available_devices()
+        # Replay captured CUDA graphs for repeated input shapes on CUDA nodes.
+        # Opt-in: models with data-dependent control flow can't be captured
+        # (such shapes fall back to eager automatically).
+        self.use_cuda_graphs = use_cuda_graphs
+        self.max_graphs_per_node = max_graphs_per_node
+        # Load encoders in bf16 on CUDA / int8 dynamic-quantized on CPU.
+        # Opt-in; a model config's own "quantize" key overrides it.
+        self.quantize = quantize
+        # process_request_async() coalesces up to batch_size concurrent requests
+        # per node, waiting at most max_batch_delay_ms for a batch to fill.
+        # batch_size=1 disables batching.
+        self.batch_size = batch_size
+        self.max_batch_delay_ms = max_batch_delay_ms
         
         self.nodes: List[ModelNode] = []
-        self.current_index = 0
-        self.round_robin_lock = threading.Lock()
+        # Batches in flight; held so the tasks aren't garbage collected
+        self._batch_tasks: set = set()
         
         # Load models
         self._load_models()
@@ -53,21 +122,40 @@ class FacebookModelSwarm:
         
         return devices
     
-    def _load_facebook_model(self, model_path: str, device: str):
+    def _device_weight(self, device: str) -> float:
+        """Rough capacity of a device, used only until latencies are measured."""
+        if device.startswith('cuda'):
+            return float(torch.cuda.get_device_properties(torch.device(device)).multi_processor_count)
+        return float(os.cpu_count() or 1)
+    
+    def _load_facebook_model(self, model_path: str, device: str, quantize: bool = False):
         """Load Facebook model (e.g., wav2vec2, hubert, etc.)."""
         try:
             from transformers import AutoModel, AutoProcessor
             
             processor = AutoProcessor.from_pretrained(model_path)
             model = AutoModel.from_pretrained(model_path)
+            model.eval()
+            input_dtype = None
             
             if device.startswith('cuda'):
-                model = model.to(device)
+                if quantize:
+                    # bf16 where supported (Ampere+), otherwise fp16
+                    with torch.cuda.device(device):
+                        input_dtype = torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+                    model = model.to(device=device, dtype=input_dtype)
+                else:
+                    model = model.to(device)
+            elif quantize:
+                model = torch.ao.quantization.quantize_dynamic(
+                    model, {torch.nn.Linear}, dtype=torch.qint8
+                )
             
             return {
                 "model": model,
                 "processor": processor,
-                "device": device
+                "device": device,
+                "input_dtype": input_dtype
             }
         except Exception as e:
             print(f"[ModelSwarm] Error loading model {model_path}: {e}")
@@ -85,12 +173,24 @@ class FacebookModelSwarm:
             device = self.devices[device_index % len(self.devices)]
             device_index += 1
             
-            # Load model
+            # Load model; "replicas" copies share the device and serve
+            # concurrent requests to this node in parallel
             start_time = datetime.now().timestamp()
-            model_data = self._load_facebook_model(model_path, device)
+            replicas = []
+            for _ in range(max(1, config.get('replicas', 1))):
+                replica_data = self._load_facebook_model(
+                    model_path, device, quantize=config.get('quantize', self.quantize)
+                )
+                if not replica_data:
+                    break
+                replicas.append(ModelReplica(
+                    model=replica_data,
+                    stream=torch.cuda.Stream(device=device) if device.startswith('cuda') else None
+                ))
             
-            if model_data:
+            if replicas:
                 load_time = datetime.now().timestamp() - start_time
+                model_data = replicas[0].model
                 
                 node = ModelNode(
                     model_id=model_id,
@@ -98,49 +198,79 @@ class FacebookModelSwarm:
                     device=device,
                     model=model_data,
                     load_time=load_time,
-                    status='idle'
+                    status='idle',
+                    torch_device=torch.device(device),
+                    is_cuda=device.startswith('cuda'),
+                    memcpy_stream=torch.cuda.Stream(device=device) if device.startswith('cuda') else None,
+                    input_dtype=model_data['input_dtype'],
+                    weight=self._device_weight(device),
+                    replicas=replicas
                 )
+                for replica in replicas:
+                    node.idle_replicas.put(replica)
                 
                 self.nodes.append(node)
-                print(f"[ModelSwarm] Loaded {model_id} on {device} (took {load_time:.2f}s)")
+                print(f"[ModelSwarm] Loaded {model_id} x{len(replicas)} on {device} (took {load_time:.2f}s)")
     
     def get_next_node(self) -> Optional[ModelNode]:
-        """Get next model node using round-robin."""
-        if not self.nodes:
+        """
+        Reserve the node with the lowest estimated completion time.
+        
+        Estimate = (requests queued ahead per replica + 1) x the node's EWMA
+        latency, so a slow CPU node and a fast GPU node each get traffic in
+        proportion to their measured speed, and a node with a free replica
+        starts the request at once. Re-evaluated on every dispatch. Nodes with no samples
+        yet borrow the swarm's mean latency; remaining ties go to the less
+        loaded, then higher-capacity device.
+        
+        The returned node counts as in flight until _release_node() is called.
+        Selection reads the per-node counters without locking: a concurrent
+        dispatch can see a count one request stale, which only perturbs a
+        heuristic, and in exchange dispatch has no swarm-wide lock.
+        """
+        nodes = self.nodes
+        if not nodes:
             return None
         
-        with self.round_robin_lock:
-            # Find next idle node
-            attempts = 0
-            while attempts < len(self.nodes):
-                node = self.nodes[self.current_index]
-                self.current_index = (self.current_index + 1) % len(self.nodes)
-                
-                if node.status == 'idle':
-                    return node
-                
-                attempts += 1
-            
-            # All nodes busy, return first one
-            return self.nodes[0]
+        measured = [n.ewma_latency for n in nodes if n.ewma_latency > 0]
+        prior = sum(measured) / len(measured) if measured else 0.0
+        node = min(
+            nodes,
+            key=lambda n: (
+                (n.inflight // max(1, len(n.replicas)) + 1) * (n.ewma_latency or prior),
+                n.inflight,
+                -n.weight,
+            ),
+        )
+        with node.stats_lock:
+            node.inflight += 1
+            node.request_count += 1
+            node.status = 'busy'
+        return node
+    
+    def _release_node(self, node: ModelNode, latency: Optional[float] = None):
+        """Finish a request reserved by get_next_node, folding in its latency."""
+        with node.stats_lock:
+            node.inflight -= 1
+            if latency is not None:
+                if node.ewma_latency:
+                    node.ewma_latency += LATENCY_EWMA_ALPHA * (latency - node.ewma_latency)
+                else:
+                    node.ewma_latency = latency
+            node.status = 'busy' if node.inflight else 'idle'
     
     def process_request(self, input_data: Any, model_type: Optional[str] = None) -> Dict:
-        """Process request with round-robin model selection."""
+        """Process request on the node with the lowest estimated completion time."""
         node = self.get_next_node()
         
         if not node:
             return {"error": "No available models"}
         
-        # Mark node as busy
-        node.status = 'busy'
-        node.request_count += 1
-        
+        start = time.perf_counter()
         try:
             # Process with model
             result = self._process_with_model(node, input_data, model_type)
-            
-            # Mark node as idle
-            node.status = 'idle'
+            self._release_node(node, time.perf_counter() - start)
             
             return {
                 "success": True,
@@ -150,48 +280,368 @@ class FacebookModelSwarm:
             }
         
         except Exception as e:
-            node.status = 'error'
+            # Failures don't feed the latency estimate
+            self._release_node(node)
             print(f"[ModelSwarm] Error processing with {node.model_id}: {e}")
             
-            # Try to recover
-            node.status = 'idle'
-            
             return {
                 "success": False,
                 "error": str(e),
                 "model_id": node.model_id
             }
     
-    def _process_with_model(self, node: ModelNode, input_data: Any, model_type: Optional[str]) -> Any:
-        """Process input with specific model."""
-        model = node.model['model']
-        processor = node.model['processor']
-        device = node.model['device']
+    async def process_request_async(self, input_data: Any, model_type: Optional[str] = None) -> Dict:
+        """
+        Async process_request() that micro-batches concurrent requests.
         
-        # Process input based on model type
-        if model_type == 'audio':
-            # Audio processing (wav2vec2, hubert, etc.)
-            inputs = processor(input_data, return_tensors="pt", sampling_rate=16000)
+        With batch_size > 1, audio/text/vision requests dispatched to the same
+        node are queued for that node's batcher and run as one forward pass;
+        anything else runs on a worker thread exactly as process_request().
+        """
+        if self.batch_size <= 1 or model_type not in BATCHABLE_TYPES:
+            return await asyncio.to_thread(self.process_request, input_data, model_type)
+        
+        node = self.get_next_node()
+        
+        if not node:
+            return {"error": "No available models"}
+        
+        loop = asyncio.get_running_loop()
+        if node.batcher is None or node.batcher.done() or node.batcher.get_loop() is not loop:
+            # First use, or the previous loop is gone (e.g. a second asyncio.run())
+            node.batch_queue = asyncio.Queue()
+            node.batcher = loop.create_task(self._batcher(node))
+        
+        # Latency includes time spent waiting for the batch to fill, which is
+        # part of what the next request to this node will see too
+        start = time.perf_counter()
+        latency = None
+        future = loop.create_future()
+        node.batch_queue.put_nowait((input_data, model_type, future))
+        try:
+            result = await future
+            latency = time.perf_counter() - start
             
-            if device.startswith('cuda'):
-                inputs = {k: v.to(device) for k, v in inputs.items()}
+            return {
+                "success": True,
+                "model_id": node.model_id,
+                "device": node.device,
+                "result": result
+            }
+        
+        except Exception as e:
+            print(f"[ModelSwarm] Error processing with {node.model_id}: {e}")
             
-            with torch.no_grad():
-                outputs = model(**inputs)
+            return {
+                "success": False,
+                "error": str(e),
+                "model_id": node.model_id
+            }
+        
+        finally:
+            # Also on cancellation (client gone, caller's timeout), or the node
+            # would count as loaded forever; only successes feed the estimate
+            self._release_node(node, latency)
+    
+    async def close(self):
+        """
+        Stop the per-node batchers. Requests still waiting for a batch are
+        cancelled; batches already running finish first. Call from the loop
+        that made the async requests. Later async requests start new batchers.
+        """
+        batchers = [n.batcher for n in self.nodes if n.batcher is not None]
+        for task in batchers:
+            task.cancel()
+        await asyncio.gather(*batchers, return_exceptions=True)
+        
+        for node in self.nodes:
+            if node.batch_queue is not None:
+                while not node.batch_queue.empty():
+                    _, _, future = node.batch_queue.get_nowait()
+                    future.cancel()
+            node.batch_queue = None
+            node.batcher = None
+        
+        if self._batch_tasks:
+            await asyncio.gather(*self._batch_tasks, return_exceptions=True)
+    
+    async def _batcher(self, node: ModelNode):
+        """Drain a node's queue into batches of up to batch_size and launch them."""
+        loop = asyncio.get_running_loop()
+        max_delay = self.max_batch_delay_ms / 1000
+        batch = []
+        try:
+            while True:
+                batch = [await node.batch_queue.get()]
+                deadline = loop.time() + max_delay
+                while len(batch) < self.batch_size:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(node.batch_queue.get(), timeout=remaining))
+                    except asyncio.TimeoutError:
+                        break
+                
+                # Not awaited: with several replicas the next batch runs alongside
+                task = loop.create_task(self._run_batch(node, batch))
+                self._batch_tasks.add(task)
+                task.add_done_callback(self._batch_tasks.discard)
+                batch = []
+        except asyncio.CancelledError:
+            # Requests collected but not yet launched would otherwise hang
+            for _, _, future in batch:
+                future.cancel()
+            raise
+    
+    async def _run_batch(self, node: ModelNode, batch: List[Tuple[Any, str, asyncio.Future]]):
+        """Run a collected batch off the event loop and resolve its futures."""
+        by_type: Dict[str, List[Tuple[Any, str, asyncio.Future]]] = {}
+        for item in batch:
+            # Skip requests whose caller was cancelled while queued
+            if not item[2].done():
+                by_type.setdefault(item[1], []).append(item)
+        
+        for model_type, items in by_type.items():
+            try:
+                results = await asyncio.to_thread(
+                    self._process_batch, node, [input_data for input_data, _, _ in items], model_type
+                )
+            except Exception as e:
+                for _, _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                for (_, _, future), result in zip(items, results):
+                    if not future.done():
+                        future.set_result(result)
+    
+    def _stage(self, node: ModelNode, name: str, parts: List[torch.Tensor]) -> torch.Tensor:
+        """
+        Copy CPU tensors of one shape to the node's device, concatenated along
+        dim 0, through its reusable pinned buffer for `name`. Must run on the
+        node's memcpy stream.
+        
+        Buffers grow to the largest input seen and are then reused, so steady
+        state does no pinned allocation; a batch is assembled by slice
+        assignment straight into the buffer, not torch.cat. Before overwriting,
+        wait for the previous H2D copy out of the same buffer to finish.
+        """
+        first = parts[0]
+        rows = first.shape[0]
+        numel = first.numel() * len(parts)
+        buf, copied = node.staging.get(name, (None, None))
+        if buf is None or buf.dtype != first.dtype or buf.numel() < numel:
+            buf = torch.empty(numel, dtype=first.dtype, pin_memory=True)
+        elif copied is not None:
+            copied.synchronize()
+        host = buf[:numel].view(rows * len(parts), *first.shape[1:])
+        for i, part in enumerate(parts):
+            host[i * rows:(i + 1) * rows] = part
+        dtype = node.input_dtype if host.is_floating_point() else None
+        out = host.to(node.torch_device, dtype=dtype, non_blocking=True)
+        copied = torch.cuda.Event()
+        copied.record(node.memcpy_stream)
+        node.staging[name] = (buf, copied)
+        return out
+    
+    def _to_device(
+        self,
+        node: ModelNode,
+        batch: List[Dict[str, Any]],
+        compute_stream: Optional[Any] = None
+    ) -> Dict[str, Any]:
+        """
+        Move processor outputs to the node's device as one model input,
+        stacking a batch of same-shaped requests along dim 0.
+        
+        On CUDA each tensor goes through the node's pre-allocated pinned
+        staging buffer and is copied on the node's memcpy stream, so copies
+        overlap with whatever the compute stream is running; the compute
+        stream (the replica's, else the device's current one) then waits on
+        the copy stream before the forward.
+        """
+        first = batch[0]
+        if not node.is_cuda:
+            if len(batch) == 1:
+                return first
+            return {
+                k: torch.cat([inputs[k] for inputs in batch]) if isinstance(v, torch.Tensor) else v
+                for k, v in first.items()
+            }
+        if compute_stream is None:
+            compute_stream = torch.cuda.current_stream(node.torch_device)
+        with node.staging_lock, torch.cuda.stream(node.memcpy_stream):
+            moved = {
+                k: self._stage(node, k, [inputs[k] for inputs in batch])
+                if isinstance(v, torch.Tensor) else v
+                for k, v in first.items()
+            }
+        compute_stream.wait_stream(node.memcpy_stream)
+        # Allocated on the copy stream but consumed on the compute stream
+        for v in moved.values():
+            if isinstance(v, torch.Tensor):
+                v.record_stream(compute_stream)
+        return moved
+    
+    def _capture_graph(self, node: ModelNode, model: Any, inputs: Dict[str, torch.Tensor]) -> Tuple:
+        """Warm up and capture one forward pass for this exact input signature."""
+        device = node.torch_device
+        static_inputs = {k: v.clone() for k, v in inputs.items()}
+        with torch.cuda.device(device):
+            # Warmup on a side stream, as capture requires
+            warmup = torch.cuda.Stream(device)
+            warmup.wait_stream(torch.cuda.current_stream(device))
+            with torch.cuda.stream(warmup):
+                for _ in range(3):
+                    model(**static_inputs)
+            torch.cuda.current_stream(device).wait_stream(warmup)
             
-            return outputs.last_hidden_state.cpu().numpy()
+            # thread_local: other threads keep using the device (other replicas
+            # and nodes, pinned allocs, event syncs, .cpu() copies) mid-capture;
+            # the default "global" mode would fail the capture on any of them
+            graph = torch.cuda.CUDAGraph()
+            with torch.cuda.graph(graph, capture_error_mode="thread_local"):
+                static_outputs = model(**static_inputs)
+        return graph, static_inputs, static_outputs
+    
+    def _forward(self, node: ModelNode, replica: ModelReplica, inputs: Dict[str, Any]) -> Any:
+        """
+        Run a replica's model, replaying a captured CUDA graph when enabled.
         
-        elif model_type == 'text':
-            # Text processing
-            inputs = processor(input_data, return_tensors="pt", padding=True)
+        Graphs are keyed by the exact input shapes/dtypes (no padding, so
+        outputs match eager). A signature runs eager the first time and is
+        captured only when it recurs, so one-off shapes (e.g. variable-length
+        audio) neither pay warmup + capture nor evict useful graphs. Outputs
+        are cloned out of the graph's static buffers before the lock is
+        released, since the next replay reuses them.
+        """
+        model = replica.model['model']
+        if not (self.use_cuda_graphs and node.is_cuda) or not all(
+            isinstance(v, torch.Tensor) for v in inputs.values()
+        ):
+            return model(**inputs)
+        
+        key = tuple((k, tuple(v.shape), v.dtype) for k, v in sorted(inputs.items()))
+        graphs = replica.graphs
+        with replica.graph_lock:
+            if key not in graphs:
+                if key not in replica.seen_once:
+                    replica.seen_once[key] = None
+                    if len(replica.seen_once) > 4 * self.max_graphs_per_node:
+                        replica.seen_once.popitem(last=False)
+                    return model(**inputs)
+                del replica.seen_once[key]
+                try:
+                    graphs[key] = self._capture_graph(node, model, inputs)
+                except Exception as e:
+                    print(f"[ModelSwarm] CUDA graph capture failed for {node.model_id}, using eager: {e}")
+                    graphs[key] = None
+                if len(graphs) > self.max_graphs_per_node:
+                    graphs.popitem(last=False)
+            else:
+                graphs.move_to_end(key)
             
-            if device.startswith('cuda'):
-                inputs = {k: v.to(device) for k, v in inputs.items()}
+            entry = graphs.get(key)
+            if entry is None:
+                return model(**inputs)
             
-            with torch.no_grad():
-                outputs = model(**inputs)
+            graph, static_inputs, static_outputs = entry
+            for k, v in inputs.items():
+                static_inputs[k].copy_(v)
+            graph.replay()
+            return type(static_outputs)(**{
+                k: v.clone() if isinstance(v, torch.Tensor) else v
+                for k, v in static_outputs.items()
+            })
+    
+    @contextmanager
+    def _checkout(self, node: ModelNode):
+        """
+        Hold one of the node's replicas for the duration of a request, with
+        its CUDA stream current so the forward, graph replay and output copies
+        all run on it.
+        """
+        replica = node.idle_replicas.get()
+        try:
+            with torch.cuda.stream(replica.stream) if replica.stream is not None else nullcontext():
+                yield replica
+        finally:
+            node.idle_replicas.put(replica)
+    
+    def _process_with_model(self, node: ModelNode, input_data: Any, model_type: Optional[str]) -> Any:
+        """Process input with specific model, on whichever replica is free."""
+        with self._checkout(node) as replica:
+            return self._process_with_replica(node, replica, input_data, model_type)
+    
+    def _process_with_replica(
+        self,
+        node: ModelNode,
+        replica: ModelReplica,
+        input_data: Any,
+        model_type: Optional[str]
+    ) -> Any:
+        """Process input with one replica of a node's model."""
+        processor = replica.model['processor']
+        inputs = self._to_device(node, [self._preprocess(processor, input_data, model_type)], replica.stream)
+        
+        if model_type not in BATCHABLE_TYPES:
+            # Always eager: the raw output object is handed back to the caller
+            with torch.inference_mode():
+                return replica.model['model'](**inputs)
+        
+        with torch.inference_mode():
+            outputs = self._forward(node, replica, inputs)
+        
+        features = self._features(outputs, model_type)
+        # float(): numpy has no bf16 (quantized nodes); a no-op for fp32 outputs
+        return features.cpu().float().numpy() if features is not None else None
+    
+    def _process_batch(self, node: ModelNode, inputs: List[Any], model_type: str) -> List[Any]:
+        """
+        Process several requests of one type in as few forward passes as possible.
+        
+        Requests whose processed inputs have identical shapes are stacked into
+        one forward and its features split back per request. Differing shapes
+        (e.g. texts of different lengths) run as separate passes rather than
+        being padded, so each requester gets what an unbatched call returns.
+        """
+        with self._checkout(node) as replica:
+            processor = replica.model['processor']
+            encoded = [self._preprocess(processor, x, model_type) for x in inputs]
+            
+            groups: Dict[Tuple, List[int]] = {}
+            for i, enc in enumerate(encoded):
+                if all(isinstance(v, torch.Tensor) for v in enc.values()):
+                    key = tuple((k, tuple(v.shape), v.dtype) for k, v in sorted(enc.items()))
+                else:
+                    key = (i,)
+                groups.setdefault(key, []).append(i)
             
-            return outputs.last_hidden_state.cpu().numpy()
+            results: List[Any] = [None] * len(inputs)
+            for indices in groups.values():
+                batch = self._to_device(node, [encoded[i] for i in indices], replica.stream)
+                with torch.inference_mode():
+                    outputs = self._forward(node, replica, batch)
+                
+                features = self._features(outputs, model_type)
+                if features is None:
+                    continue
+                # One device-to-host copy for the whole batch, then split per request
+                rows = features.shape[0] // len(indices)
+                for i, part in zip(indices, features.cpu().float().split(rows, 0)):
+                    results[i] = part.numpy()
+            return results
+    
+    def _preprocess(self, processor: Any, input_data: Any, model_type: Optional[str]) -> Dict[str, Any]:
+        """Run the model's processor on one request's input (CPU tensors)."""
+        if model_type == 'audio':
+            # Audio processing (wav2vec2, hubert, etc.)
+            return processor(input_data, return_tensors="pt", sampling_rate=16000)
+        
+        elif model_type == 'text':
+            # Text processing
+            return processor(input_data, return_tensors="pt", padding=True)
         
         elif model_type == 'vision':
             # Vision processing (MetaCLIP, DINOv2, etc.)
@@ -210,35 +660,20 @@ class FacebookModelSwarm:
                 image = input_data
             
             # Process image
-            inputs = processor(images=image, return_tensors="pt")
-            
-            if device.startswith('cuda'):
-                inputs = {k: v.to(device) if isinstance(v, torch.Tensor) else v 
-                         for k, v in inputs.items()}
-            
-            with torch.no_grad():
-                outputs = model(**inputs)
-            
-            # Extract features
-            if hasattr(outputs, 'last_hidden_state'):
-                return outputs.last_hidden_state.cpu().numpy()
-            elif hasattr(outputs, 'pooler_output'):
-                return outputs.pooler_output.cpu().numpy()
-            else:
-                # Return first tensor output
-                return list(outputs.values())[0].cpu().numpy() if outputs else None
+            return processor(images=image, return_tensors="pt")
         
-        else:
-            # Generic processing
-            inputs = processor(input_data, return_tensors="pt")
-            
-            if device.startswith('cuda'):
-                inputs = {k: v.to(device) for k, v in inputs.items()}
-            
-            with torch.no_grad():
-                outputs = model(**inputs)
-            
-            return outputs
+        # Generic processing
+        return processor(input_data, return_tensors="pt")
+    
+    @staticmethod
+    def _features(outputs: Any, model_type: str) -> Optional[torch.Tensor]:
+        """Pick the feature tensor out of a forward pass's outputs."""
+        if model_type != 'vision' or hasattr(outputs, 'last_hidden_state'):
+            return outputs.last_hidden_state
+        elif hasattr(outputs, 'pooler_output'):
+            return outputs.pooler_output
+        # Return first tensor output
+        return list(outputs.values())[0] if outputs else None
     
     def extract_3d_geometry(self, image: Any) -> Dict[str, Any]:
         """
@@ -317,6 +752,7 @@ class FacebookModelSwarm:
                     "model_id": n.model_id,
                     "device": n.device,
                     "status": n.status,
+                    "replicas": len(n.replicas),
                     "request_count": n.request_count
                 }
                 for n in self.nodes
@@ -328,7 +764,8 @@ class FacebookModelSwarm:
 FACEBOOK_MODELS = [
     {
         "model_id": "wav2vec2-base",
-        "model_path": "facebook/wav2vec2-base-960h"
+        "model_path": "facebook/wav2vec2-base-960h",
+        "replicas": 2
     },
     {
         "model_id": "wav2vec2-large",
@@ -336,7 +773,8 @@ FACEBOOK_MODELS = [
     },
     {
         "model_id": "hubert-base",
-        "model_path": "facebook/hubert-base-ls960"
+        "model_path": "facebook/hubert-base-ls960",
+        "replicas": 2
     },
     {
         "model_id": "hubert-large",
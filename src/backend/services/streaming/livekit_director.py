@@ -12,11 +12,7 @@ from dataclasses import dataclass
 from datetime import datetime
 import logging
 
-# Add services to path
-import sys
-from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent))
-from emotion_fusion import get_fusion, EmotionState
+from src.backend.services.ai.emotion_fusion import get_fusion, EmotionState
 
 
 @dataclass
@@ -1,23 +1,78 @@
 import asyncio
+import codecs
 import subprocess
 import json
+import time
 import uuid
-from typing import Dict, Optional, List
+import orjson
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, List
 from datetime import datetime
 from pathlib import Path
-from src.backend.services.tools.tool_registry import registry, Tool
+from src.backend.services.tools.tool_registry import registry, Tool, Perm
+
+MCP_MAX_CONCURRENCY = 50  # In-flight MCP requests before callers queue
+MCP_TIMEOUT_S = 30
+SCRIPT_OUTPUT_LIMIT = 4 * 1024 * 1024  # Bytes of stdout+stderr before a script is killed
+SCRIPT_READ_CHUNK = 64 * 1024
+UNDO_MAX_CONCURRENCY = 16  # Independent targets reverted at once by undo_session
+MAX_SESSIONS = 10_000  # Oldest sessions are evicted (and can no longer be undone)
+
+
+@dataclass(slots=True)
+class SessionState:
+    """Per-execution state kept for undo"""
+    tool: Tool
+    intent: str
+    context: Dict[str, Any]
+    start_time: datetime
+    mutations: List[Dict] = field(default_factory=list)
 
 
 class AgentExecutor:
     """Execute tools in a sandboxed environment with permission checks"""
 
     def __init__(self):
-        self.active_sessions: Dict[str, Dict] = {}
+        # Insertion-ordered so the oldest sessions can be evicted past MAX_SESSIONS
+        self.active_sessions: "OrderedDict[str, SessionState]" = OrderedDict()
         self.fs_allowlist = [
             "D:/Zero2oneZ/output",
             "D:/Zero2oneZ/temp",
         ]
         self.gpu_budget_tokens = 1000  # Max GPU compute tokens
+        # Shared HTTP session for MCP calls (keep-alive, pooled connections);
+        # created lazily on the running loop, closed by close()
+        self._http = None
+        self._mcp_semaphore = asyncio.Semaphore(MCP_MAX_CONCURRENCY)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        """Close the shared MCP HTTP session"""
+        if self._http is not None:
+            await self._http.close()
+            self._http = None
+
+    def _get_http_session(self):
+        import aiohttp
+
+        if self._http is None or self._http.closed:
+            connector = aiohttp.TCPConnector(
+                limit=100,
+                limit_per_host=20,
+                keepalive_timeout=60,
+                ttl_dns_cache=300,
+            )
+            self._http = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=MCP_TIMEOUT_S),
+            )
+        return self._http
 
     async def execute(
         self,
@@ -39,17 +94,20 @@ class AgentExecutor:
             "execution_time_ms": 1234
         }
         """
-        session_id = str(uuid.uuid4())
+        session_id = uuid.uuid4().hex
         start_time = datetime.now()
+        start_ns = time.perf_counter_ns()
 
         # Create session
-        self.active_sessions[session_id] = {
-            "tool": tool,
-            "intent": intent,
-            "context": context,
-            "mutations": [],
-            "start_time": start_time,
-        }
+        session = SessionState(
+            tool=tool,
+            intent=intent,
+            context=context,
+            start_time=start_time,
+        )
+        self.active_sessions[session_id] = session
+        while len(self.active_sessions) > MAX_SESSIONS:
+            self.active_sessions.popitem(last=False)
 
         try:
             # 1. Check permissions
@@ -80,7 +138,7 @@ class AgentExecutor:
                 raise ValueError(f"Unknown command type: {command_type}")
 
             # 3. Track execution time
-            execution_time = int((datetime.now() - start_time).total_seconds() * 1000)
+            execution_time = (time.perf_counter_ns() - start_ns) // 1_000_000
 
             # 4. Log telemetry
             await registry.log_telemetry(
@@ -101,7 +159,7 @@ class AgentExecutor:
                 "session_id": session_id,
                 "success": result["success"],
                 "output": result.get("output"),
-                "mutations": self.active_sessions[session_id]["mutations"],
+                "mutations": session.mutations,
                 "execution_time_ms": execution_time,
                 "error": result.get("error"),
             }
@@ -116,37 +174,25 @@ class AgentExecutor:
 
     async def _check_permissions(self, tool: Tool) -> Dict:
         """Check if tool has required permissions"""
-        required = tool.required_perms or []
+        # Check file system permissions
+        if tool.invalid_fs_perm is not None:
+            return {"allowed": False, "reason": f"Invalid FS permission: {tool.invalid_fs_perm}"}
 
-        for perm in required:
-            if perm.startswith("fs:"):
-                # Check file system permissions
-                action = perm.split(":")[1]
-                if action not in ["read", "write"]:
-                    return {"allowed": False, "reason": f"Invalid FS permission: {action}"}
+        # Check GPU budget
+        if tool.perm_flags & Perm.GPU and self.gpu_budget_tokens < 100:
+            return {"allowed": False, "reason": "Insufficient GPU budget"}
 
-            elif perm.startswith("gpu:"):
-                # Check GPU budget
-                if self.gpu_budget_tokens < 100:
-                    return {"allowed": False, "reason": "Insufficient GPU budget"}
-
-            elif perm == "network":
-                # Network access check
-                pass  # TODO: Implement network sandboxing
+        # Network access check
+        # TODO: Implement network sandboxing (tool.perm_flags & Perm.NETWORK)
 
         return {"allowed": True}
 
     def _generate_intent_card(self, tool: Tool, intent: str, context: Dict) -> Dict:
         """Generate an intent card for user approval"""
-        return {
-            "tool_name": tool.name,
-            "description": tool.description,
-            "intent": intent,
-            "context": context,
-            "required_perms": tool.required_perms,
-            "estimated_duration": "< 1 minute",
-            "risk_level": "medium" if "fs:write" in tool.required_perms else "low",
-        }
+        card = dict(tool.intent_card_template)
+        card["intent"] = intent
+        card["context"] = context
+        return card
 
     async def _execute_script(self, session_id: str, schema: Dict, params: Dict) -> Dict:
         """Execute a Python script"""
@@ -165,17 +211,40 @@ class AgentExecutor:
                 cwd="D:/Zero2oneZ",
             )
 
-            stdout, stderr = await process.communicate()
+            # Decode both pipes incrementally instead of buffering the raw bytes
+            # and decoding them afterwards; kill the script past the output cap
+            budget = [SCRIPT_OUTPUT_LIMIT]
+
+            async def drain(stream: asyncio.StreamReader) -> str:
+                decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+                parts: List[str] = []
+                while chunk := await stream.read(SCRIPT_READ_CHUNK):
+                    budget[0] -= len(chunk)
+                    if budget[0] < 0:
+                        process.kill()
+                        break
+                    parts.append(decoder.decode(chunk))
+                parts.append(decoder.decode(b"", final=True))
+                return "".join(parts)
+
+            stdout, stderr = await asyncio.gather(drain(process.stdout), drain(process.stderr))
+            await process.wait()
+
+            if budget[0] < 0:
+                return {
+                    "success": False,
+                    "error": f"Script output exceeded {SCRIPT_OUTPUT_LIMIT} bytes",
+                }
 
             if process.returncode == 0:
                 return {
                     "success": True,
-                    "output": {"stdout": stdout.decode(), "stderr": stderr.decode()},
+                    "output": {"stdout": stdout, "stderr": stderr},
                 }
             else:
                 return {
                     "success": False,
-                    "error": stderr.decode(),
+                    "error": stderr,
                 }
 
         except Exception as e:
@@ -183,8 +252,6 @@ class AgentExecutor:
 
     async def _execute_mcp(self, session_id: str, schema: Dict, params: Dict) -> Dict:
         """Execute an MCP tool via HTTP"""
-        import aiohttp
-
         endpoint = schema.get("endpoint")
         method = schema.get("method", "POST")
         path = schema.get("path", "/execute")
@@ -192,10 +259,11 @@ class AgentExecutor:
         url = f"{endpoint}{path}"
 
         try:
-            async with aiohttp.ClientSession() as session:
+            session = self._get_http_session()
+            async with self._mcp_semaphore:
                 async with session.request(method, url, json=params) as resp:
                     if resp.status == 200:
-                        result = await resp.json()
+                        result = orjson.loads(await resp.read())
                         return {"success": True, "output": result}
                     else:
                         return {"success": False, "error": f"HTTP {resp.status}"}
@@ -215,7 +283,7 @@ class AgentExecutor:
         }
 
         # Track mutation
-        self.active_sessions[session_id]["mutations"].append({
+        self.active_sessions[session_id].mutations.append({
             "type": "scene_add",
             "target": component,
             "data": params,
@@ -242,15 +310,35 @@ class AgentExecutor:
             return {"success": False, "error": "Session not found"}
 
         session = self.active_sessions[session_id]
-        mutations = session["mutations"]
+        mutations = session.mutations
 
-        # Reverse mutations
+        # Mutations on the same target must be reversed newest-first; different
+        # targets are independent, so their chains run concurrently
+        chains: Dict[str, List[Dict]] = {}
         for mutation in reversed(mutations):
-            await self._reverse_mutation(mutation)
+            chains.setdefault(str(mutation.get("target")), []).append(mutation)
+
+        semaphore = asyncio.Semaphore(UNDO_MAX_CONCURRENCY)
+        failures: List[Dict] = []
+
+        async def reverse_chain(chain: List[Dict]):
+            async with semaphore:
+                for mutation in chain:
+                    try:
+                        await self._reverse_mutation(mutation)
+                    except Exception as e:
+                        failures.append({
+                            "type": mutation["type"],
+                            "target": mutation.get("target"),
+                            "error": str(e),
+                        })
+
+        await asyncio.gather(*(reverse_chain(chain) for chain in chains.values()))
 
         return {
-            "success": True,
-            "undone_mutations": len(mutations),
+            "success": not failures,
+            "undone_mutations": len(mutations) - len(failures),
+            "failures": failures,
         }
 
     async def _reverse_mutation(self, mutation: Dict):
@@ -259,12 +347,11 @@ class AgentExecutor:
 
         if mutation_type == "file_create":
             # Delete created file
-            Path(mutation["target"]).unlink(missing_ok=True)
+            await asyncio.to_thread(Path(mutation["target"]).unlink, missing_ok=True)
 
         elif mutation_type == "file_edit":
             # Restore previous content
-            with open(mutation["target"], "w") as f:
-                f.write(mutation["before_state"])
+            await asyncio.to_thread(Path(mutation["target"]).write_text, mutation["before_state"])
 
         elif mutation_type == "scene_add":
             # Remove added object
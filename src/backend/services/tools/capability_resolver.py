@@ -1,6 +1,55 @@
-from typing import List, Dict, Optional
+from datetime import datetime
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, List, Dict, Mapping, Optional, Tuple
 from src.backend.services.tools.tool_registry import registry, Tool
 
+# Radial menu category -> registry tags
+_CATEGORY_TAGS: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+    "modeling": ("modeling", "3d", "geometry"),
+    "ai": ("ai", "generation", "ml"),
+    "rigging": ("rigging", "ik", "bones"),
+    "animation": ("animation", "keyframe"),
+    "rendering": ("render", "material", "shader"),
+})
+
+
+class _FrozenDict(tuple):
+    """Hashable stand-in for a dict: sorted (key, value) pairs."""
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively convert dicts/lists into hashable equivalents for memoization."""
+    if isinstance(value, dict):
+        return _FrozenDict(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+@lru_cache(maxsize=4096)
+def _predicate_score(frozen_context: _FrozenDict, frozen_predicates: _FrozenDict) -> float:
+    """Context-predicate part of a tool's score; depends only on (context, predicates)."""
+    context = dict(frozen_context)
+    score = 0.0
+    for key, expected_value in frozen_predicates:
+        if key in context:
+            if expected_value is None:
+                # Tool accepts any value for this key
+                score += 0.5
+            elif context[key] == expected_value:
+                # Exact match
+                score += 2.0
+            elif isinstance(context[key], _FrozenDict) and isinstance(expected_value, _FrozenDict):
+                # Nested match (e.g., selection.type)
+                nested = dict(context[key])
+                nested_matches = sum(
+                    1 for k, v in expected_value
+                    if nested.get(k) == v
+                )
+                score += nested_matches * 1.5
+    return score
+
 
 class CapabilityResolver:
     """Filter tools based on current context (selection, scene state, app mode)"""
@@ -37,13 +86,19 @@ class CapabilityResolver:
         if context.get("mode"):
             filters["mode"] = context["mode"]
 
+        # With Postgres available, scoring and the top-20 cut happen in SQL
+        if registry.pool:
+            return await registry.rank_tools(context, context=filters, limit=20, min_score=0)
+
         # Search registry with context filters
         tools = await registry.search_tools(context=filters, query=query, limit=50)
 
         # Score tools based on context match quality
+        frozen_context = _freeze(context)
+        now = datetime.now()
         scored_tools = []
         for tool in tools:
-            score = self._score_tool(tool, context)
+            score = self._score_tool(tool, context, frozen_context, now)
             if score > 0:
                 scored_tools.append((score, tool))
 
@@ -53,39 +108,33 @@ class CapabilityResolver:
         # Return top tools
         return [tool for score, tool in scored_tools[:20]]
 
-    def _score_tool(self, tool: Tool, context: Dict) -> float:
+    def _score_tool(
+        self,
+        tool: Tool,
+        context: Dict,
+        frozen_context: Optional[_FrozenDict] = None,
+        now: Optional[datetime] = None,
+    ) -> float:
         """
         Score a tool based on how well it matches the context.
         Higher score = better match.
+        
+        Callers scoring many tools against one context should pass the
+        pre-frozen context and a single `now` so both are computed once.
         """
         score = 0.0
 
         # Base score from usage count (popular tools get a boost)
         score += min(tool.usage_count * 0.01, 1.0)
 
-        # Match context predicates
-        predicates = tool.context_predicates or {}
-        
-        for key, expected_value in predicates.items():
-            if key in context:
-                if expected_value is None:
-                    # Tool accepts any value for this key
-                    score += 0.5
-                elif context[key] == expected_value:
-                    # Exact match
-                    score += 2.0
-                elif isinstance(context[key], dict) and isinstance(expected_value, dict):
-                    # Nested match (e.g., selection.type)
-                    nested_matches = sum(
-                        1 for k, v in expected_value.items()
-                        if context[key].get(k) == v
-                    )
-                    score += nested_matches * 1.5
+        # Match context predicates (memoized per context/predicates pair)
+        if frozen_context is None:
+            frozen_context = _freeze(context)
+        score += _predicate_score(frozen_context, _freeze(tool.context_predicates or {}))
 
         # Recency boost (recently used tools rank higher)
         if tool.last_used:
-            from datetime import datetime, timedelta
-            age = (datetime.now() - tool.last_used).total_seconds()
+            age = ((now or datetime.now()) - tool.last_used).total_seconds()
             if age < 3600:  # Used in last hour
                 score += 1.0
             elif age < 86400:  # Used in last day
@@ -95,22 +144,18 @@ class CapabilityResolver:
 
     async def get_by_category(self, category: str, context: Dict) -> List[Tool]:
         """Get tools for a specific radial menu category"""
-        # Map category to tags
-        category_tags = {
-            "modeling": ["modeling", "3d", "geometry"],
-            "ai": ["ai", "generation", "ml"],
-            "rigging": ["rigging", "ik", "bones"],
-            "animation": ["animation", "keyframe"],
-            "rendering": ["render", "material", "shader"],
-        }
-
-        tags = category_tags.get(category, [category])
+        tags = list(_CATEGORY_TAGS.get(category, (category,)))
         
+        if registry.pool:
+            return await registry.rank_tools(context, tags=tags, context=context, limit=8)
+
         # Search with tags and context
         tools = await registry.search_tools(tags=tags, context=context, limit=8)
         
         # Score and sort
-        scored = [(self._score_tool(t, context), t) for t in tools]
+        frozen_context = _freeze(context)
+        now = datetime.now()
+        scored = [(self._score_tool(t, context, frozen_context, now), t) for t in tools]
         scored.sort(key=lambda x: x[0], reverse=True)
         
         return [t for _, t in scored]
@@ -0,0 +1,117 @@
+"""
+Micro-batching tests for FacebookModelSwarm.process_request_async.
+
+Models are never loaded: replicas carry placeholder model data and
+_process_batch is replaced, so only the async batching path is exercised.
+Run from the repository root with `python -m pytest tests`.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+pytest.importorskip("torch")
+
+from src.backend.services.ai.facebook_swarm.model_swarm import FacebookModelSwarm
+
+
+class _Swarm(FacebookModelSwarm):
+    """Swarm on CPU with placeholder models and a scripted batch runner."""
+
+    def __init__(self, **kwargs):
+        self.batch_sizes = []
+        self.release = None  # threading.Event the batch runner waits on, if set
+        super().__init__([{"model_id": "n0", "model_path": "unused", "replicas": 2}], devices=["cpu"], **kwargs)
+
+    def _load_facebook_model(self, model_path, device, quantize=False):
+        return {"model": None, "processor": None, "device": device, "input_dtype": None}
+
+    def _device_weight(self, device):
+        return 1.0
+
+    def _process_batch(self, node, inputs, model_type):
+        with self._checkout(node):
+            self.batch_sizes.append(len(inputs))
+            if self.release is not None:
+                self.release.wait(5)
+            if "boom" in inputs:
+                raise RuntimeError("boom")
+            return [x * 10 for x in inputs]
+
+
+def test_concurrent_requests_are_batched():
+    swarm = _Swarm(batch_size=4, max_batch_delay_ms=50)
+
+    async def run():
+        results = await asyncio.gather(*(swarm.process_request_async(i, "audio") for i in range(10)))
+        await swarm.close()
+        return results
+
+    results = asyncio.run(run())
+
+    assert [r["result"] for r in results] == [i * 10 for i in range(10)]
+    assert all(r["success"] for r in results)
+    assert swarm.batch_sizes == [4, 4, 2]
+    assert swarm.nodes[0].inflight == 0
+    assert swarm.nodes[0].status == "idle"
+
+
+def test_batch_exception_reaches_every_request():
+    swarm = _Swarm(batch_size=4, max_batch_delay_ms=50)
+
+    async def run():
+        results = await asyncio.gather(*(swarm.process_request_async(x, "text") for x in ["a", "boom", "c"]))
+        await swarm.close()
+        return results
+
+    results = asyncio.run(run())
+
+    assert swarm.batch_sizes == [3]
+    assert [r["success"] for r in results] == [False, False, False]
+    assert all(r["error"] == "boom" for r in results)
+    assert swarm.nodes[0].inflight == 0
+    # Failures don't feed the latency estimate
+    assert swarm.nodes[0].ewma_latency == 0.0
+
+
+def test_cancelled_request_releases_node():
+    swarm = _Swarm(batch_size=2, max_batch_delay_ms=1)
+    swarm.release = threading.Event()
+
+    async def run():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(swarm.process_request_async(1, "vision"), timeout=0.1)
+        inflight = swarm.nodes[0].inflight
+        swarm.release.set()
+        await swarm.close()
+        return inflight
+
+    assert asyncio.run(run()) == 0
+    assert swarm.nodes[0].ewma_latency == 0.0
+
+
+def test_close_cancels_queued_requests_and_batching_restarts():
+    swarm = _Swarm(batch_size=8, max_batch_delay_ms=10_000)
+
+    async def run():
+        pending = asyncio.ensure_future(swarm.process_request_async(1, "audio"))
+        await asyncio.sleep(0.05)
+        await swarm.close()
+        with pytest.raises(asyncio.CancelledError):
+            await pending
+
+    asyncio.run(run())
+    node = swarm.nodes[0]
+    assert node.inflight == 0
+    assert node.batcher is None and node.batch_queue is None
+
+    # A new event loop gets a new batcher
+    swarm.max_batch_delay_ms = 1
+
+    async def again():
+        result = await swarm.process_request_async(2, "audio")
+        await swarm.close()
+        return result
+
+    assert asyncio.run(again())["result"] == 20